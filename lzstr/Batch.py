@@ -0,0 +1,56 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import functools
+import multiprocessing
+from .LZString import LZStringCompressor, LZStringDecompressor, LZStringFormat
+
+def _capture(function, item):
+	try:
+		return function(item)
+	except Exception as e:
+		return e
+
+def _compress_one(data: bytes | str, output_format: LZStringFormat):
+	return LZStringCompressor.compress_to(data, output_format)
+
+def _decompress_one(encoded: bytes | str, input_format: LZStringFormat, as_text: bool):
+	result = LZStringDecompressor.decompress_from(encoded, input_format, as_text = as_text)
+	return result if as_text else bytes(result)
+
+def _run_many(function, items, processes: int | None, chunksize: int, capture_errors: bool):
+	if capture_errors:
+		function = functools.partial(_capture, function)
+	if processes == 1:
+		yield from map(function, items)
+	else:
+		with multiprocessing.Pool(processes) as pool:
+			yield from pool.imap(function, items, chunksize = chunksize)
+
+def compress_many(items, output_format: LZStringFormat = LZStringFormat.Bytes, processes: int | None = None, chunksize: int = 16, capture_errors: bool = False, stream: bool = False):
+	function = functools.partial(_compress_one, output_format = LZStringFormat(output_format))
+	results = _run_many(function, items, processes = processes, chunksize = chunksize, capture_errors = capture_errors)
+	return results if stream else list(results)
+
+def decompress_many(items, input_format: LZStringFormat = LZStringFormat.Bytes, as_text: bool = False, processes: int | None = None, chunksize: int = 16, capture_errors: bool = False, stream: bool = False):
+	function = functools.partial(_decompress_one, input_format = LZStringFormat(input_format), as_text = as_text)
+	results = _run_many(function, items, processes = processes, chunksize = chunksize, capture_errors = capture_errors)
+	return results if stream else list(results)
@@ -0,0 +1,74 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+from .BitString import _REVERSE_BITS
+from .Exceptions import LZStringTruncatedInputException
+
+class BitReader():
+	_REFILL_BYTES = 8
+
+	def __init__(self, chunks):
+		# Chunks are (data, bitlen) tuples, bits of data beyond bitlen are
+		# padding and never read
+		self._chunks = iter(chunks)
+		self._data = b""
+		self._databits = 0
+		self._bytepos = 0
+		self._acc = 0
+		self._accbits = 0
+		self._bits_read = 0
+
+	@property
+	def bits_read(self):
+		return self._bits_read
+
+	def _refill(self, count: int):
+		while self._accbits < count:
+			if self._bytepos >= len(self._data):
+				chunk = next(self._chunks, None)
+				if chunk is None:
+					raise LZStringTruncatedInputException(f"input stream truncated, tried to read {count} bits with only {self._accbits} remaining")
+				(data, bitlen) = chunk
+				if not isinstance(data, (bytes, bytearray)):
+					data = bytes(data)
+				self._data = data
+				self._databits = min(bitlen, 8 * len(data))
+				self._bytepos = 0
+			else:
+				window = self._data[self._bytepos : self._bytepos + self._REFILL_BYTES]
+				bits = min(8 * len(window), self._databits)
+				value = int.from_bytes(window.translate(_REVERSE_BITS), "little") & ((1 << bits) - 1)
+				self._acc |= value << self._accbits
+				self._accbits += bits
+				self._databits -= bits
+				self._bytepos += len(window)
+
+	def read_bits(self, count: int):
+		if self._accbits < count:
+			self._refill(count)
+		value = self._acc & ((1 << count) - 1)
+		self._acc >>= count
+		self._accbits -= count
+		self._bits_read += count
+		return value
+
+	def read_chars(self, count: int):
+		return self.read_bits(8 * count).to_bytes(count, "little")
@@ -19,6 +19,12 @@
 #
 #	Johannes Bauer <JohannesBauer@gmx.de>
 
+import re
+import os
+import mmap
+from .StreamFormat import StreamFormat, Uint8ArrayFormat, RawStringFormat, UTF16Format
+from .SixBitAlphabet import SixBitAlphabet
+
 def _swap_bit_order(x: int, bitcount: int = 8):
 	y = 0
 	for i in range(bitcount):
@@ -26,11 +32,15 @@ def _swap_bit_order(x: int, bitcount: int = 8):
 			y |= (1 << (bitcount - 1 - i))
 	return y
 
+_REVERSE_BITS = bytes(_swap_bit_order(i) for i in range(256))
+_NON_BIT_CHARS = re.compile("[^01]+")
+
 class BitString():
-	_BASE64 = { char: _swap_bit_order(index, 6) for (index, char) in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/") }
-	_URI_COMPONENT = { char: _swap_bit_order(index, 6) for (index, char) in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-") }
-	_INV_BASE64 = { value: key for (key, value) in _BASE64.items() }
-	_INV_URI_COMPONENT = { value: key for (key, value) in _URI_COMPONENT.items() }
+	_BASE64 = SixBitAlphabet.Base64
+	_URI_COMPONENT = SixBitAlphabet.URIComponent
+	_UINT8_ARRAY = Uint8ArrayFormat()
+	_RAW_STRING = RawStringFormat()
+	_UTF16 = UTF16Format()
 
 	def __init__(self):
 		self._bs = bytearray()
@@ -44,6 +54,9 @@ class BitString():
 	def seek(self, pos: int):
 		self._pos = pos
 
+	def tell(self):
+		return self._pos
+
 	def _convpos(self, pos: int):
 		(bytepos, bitpos) = divmod(pos, 8)
 		bitpos = 7 - bitpos
@@ -70,82 +83,122 @@ class BitString():
 
 	def append(self, bit: int):
 		assert(bit in [ 0, 1 ])
-		self.set_bit(self._bitlen, bit)
+		self.append_value(bit, 1)
 
 	def append_value(self, value: int, bitcount: int):
-		for i in range(bitcount):
-			if (1 << i) & value:
-				self.append(1)
-			else:
-				self.append(0)
+		# Values are LSB-first, bytes are filled MSB-first: accumulate LSB-first
+		# and flush every complete byte through the bit reversal table.
+		data = self._bs
+		accbits = self._bitlen & 7
+		acc = _REVERSE_BITS[data.pop()] if (accbits > 0) else 0
+		acc |= (value & ((1 << bitcount) - 1)) << accbits
+		accbits += bitcount
+		while accbits >= 8:
+			data.append(_REVERSE_BITS[acc & 0xff])
+			acc >>= 8
+			accbits -= 8
+		if accbits > 0:
+			data.append(_REVERSE_BITS[acc])
+		self._bitlen += bitcount
 
 	def read_bits(self, count):
-		result = 0
-		for i in range(count):
-			result |= self.get_bit(self._pos + i) << i
-		self._pos += count
-		return result
+		pos = self._pos
+		window = self._bs[pos >> 3 : (pos + count + 7) >> 3].translate(_REVERSE_BITS)
+		self._pos = pos + count
+		return (int.from_bytes(window, "little") >> (pos & 7)) & ((1 << count) - 1)
 
 	def read_chars(self, count):
-		result = bytearray(count)
-		for i in range(count):
-			result[i] = self.read_bits(8)
-		return result
+		return bytearray(self.read_bits(8 * count).to_bytes(count, "little"))
+
+	def read_word(self, bytepos: int, count: int = 8):
+		# Bytes past the end read as zero, bit order as for read_bits()
+		return int.from_bytes(self._bs[bytepos : bytepos + count].translate(_REVERSE_BITS), "little")
 
 	@classmethod
-	def _from_6bit_alphabet(cls, input_text, alphabet):
-		assert(len(alphabet) == 64)
+	def from_format(cls, encoded: bytes | str, stream_format: StreamFormat):
 		bitstring = BitString()
-		for char in input_text:
-			if char not in alphabet:
-				break
-			else:
-				bitstring.append_value(alphabet[char], 6)
+		(bitstring._bs, bitstring._bitlen) = stream_format.decode(encoded)
 		return bitstring
 
-	def _to_6bit_alphabet(self, alphabet: str):
-		assert(len(alphabet) == 64)
-		char_count = (self.bit_len + 5) // 6
-		result = [ ]
-		self.seek(0)
-		for charno in range(char_count):
-			index = self.read_bits(6)
-			result.append(alphabet[index])
-		return "".join(result)
+	def to_format(self, stream_format: StreamFormat):
+		return stream_format.encode_final(self._bs, self._bitlen)
 
 	@classmethod
 	def from_base64(cls, input_text: str):
-		return cls._from_6bit_alphabet(input_text, cls._BASE64)
+		return cls.from_format(input_text, cls._BASE64)
 
 	@classmethod
 	def from_url_component(cls, input_text: str):
-		return cls._from_6bit_alphabet(input_text, cls._URI_COMPONENT)
+		return cls.from_format(input_text, cls._URI_COMPONENT)
+
+	@classmethod
+	def from_utf16(cls, input_text: str):
+		return cls.from_format(input_text, cls._UTF16)
+
+	@classmethod
+	def from_raw_string(cls, input_text: str):
+		return cls.from_format(input_text, cls._RAW_STRING)
+
+	@classmethod
+	def from_uint8array(cls, data: bytes):
+		return cls.from_format(data, cls._UINT8_ARRAY)
 
 	@classmethod
 	def from_bit_text(cls, text: str):
-		bitstring = BitString()
-		for char in text:
-			if char == "0":
-				bitstring.append(0)
-			elif char == "1":
-				bitstring.append(1)
-		return bitstring
+		bits = _NON_BIT_CHARS.sub("", text)
+		if len(bits) == 0:
+			return BitString()
+		byte_count = (len(bits) + 7) // 8
+		value = int(bits, 2) << ((8 * byte_count) - len(bits))
+		return BitString.from_bytes(value.to_bytes(byte_count, "big"), len(bits))
 
 	@classmethod
-	def from_bytes(cls, data: bytes):
+	def from_bytes(cls, data: bytes, bitlen: int | None = None):
 		bitstring = BitString()
 		bitstring._bs = bytearray(data)
-		bitstring._bitlen = len(data) * 8
+		bitstring._bitlen = (len(data) * 8) if (bitlen is None) else bitlen
 		return bitstring
 
+	@classmethod
+	def from_buffer(cls, data: bytes | bytearray | memoryview | mmap.mmap):
+		# Wraps the buffer without copying it; the BitString must then only be
+		# read from.
+		if isinstance(data, (bytes, bytearray, mmap.mmap)):
+			bitstring = BitString()
+			bitstring._bs = data
+		else:
+			bitstring = _MemoryViewBitString()
+			bitstring._bs = memoryview(data).cast("B")
+		bitstring._bitlen = 8 * len(bitstring._bs)
+		return bitstring
+
+	@classmethod
+	def from_file(cls, filename: str):
+		with open(filename, "rb") as f:
+			if os.fstat(f.fileno()).st_size == 0:
+				return cls.from_buffer(b"")
+			return cls.from_buffer(mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ))
+
 	def to_base64(self):
-		return self._to_6bit_alphabet(self._INV_BASE64)
+		return self.to_format(self._BASE64)
 
 	def to_url_component(self):
-		return self._to_6bit_alphabet(self._INV_URI_COMPONENT)
+		return self.to_format(self._URI_COMPONENT)
+
+	def to_utf16(self):
+		return self.to_format(self._UTF16)
+
+	def to_raw_string(self):
+		return self.to_format(self._RAW_STRING)
+
+	def to_uint8array(self):
+		return self.to_format(self._UINT8_ARRAY)
 
 	def to_text(self):
-		return "".join("1" if self.get_bit(i) else "0" for i in range(self._bitlen))
+		if self._bitlen == 0:
+			return ""
+		byte_count = (self._bitlen + 7) // 8
+		return format(int.from_bytes(self._bs[:byte_count], "big"), f"0{8 * byte_count}b")[:self._bitlen]
 
 	def __bytes__(self):
 		return bytes(self._bs)
@@ -155,3 +208,13 @@ class BitString():
 
 	def __repr__(self):
 		return f"BitString<{self._bitlen} bits: {self.to_text()}>"
+
+class _MemoryViewBitString(BitString):
+	def read_bits(self, count):
+		pos = self._pos
+		window = self._bs[pos >> 3 : (pos + count + 7) >> 3].tobytes().translate(_REVERSE_BITS)
+		self._pos = pos + count
+		return (int.from_bytes(window, "little") >> (pos & 7)) & ((1 << count) - 1)
+
+	def read_word(self, bytepos: int, count: int = 8):
+		return int.from_bytes(self._bs[bytepos : bytepos + count].tobytes().translate(_REVERSE_BITS), "little")
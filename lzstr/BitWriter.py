@@ -0,0 +1,92 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import copy
+from .BitString import BitString, _REVERSE_BITS
+
+class BitWriter():
+	def __init__(self):
+		self._data = bytearray()
+		self.reset()
+
+	def reset(self):
+		self._data.clear()
+		self._acc = 0
+		self._accbits = 0
+		self._bitlen = 0
+		self._taken_bytes = 0
+
+	@property
+	def bit_len(self):
+		return self._bitlen
+
+	@property
+	def taken_bytes(self):
+		return self._taken_bytes
+
+	@property
+	def pending_bit_len(self):
+		return self._bitlen - (8 * self._taken_bytes)
+
+	def append_value(self, value: int, bitcount: int):
+		acc = self._acc | (value << self._accbits)
+		accbits = self._accbits + bitcount
+		if accbits >= 8:
+			data = self._data
+			while accbits >= 8:
+				data.append(_REVERSE_BITS[acc & 0xff])
+				acc >>= 8
+				accbits -= 8
+		self._acc = acc
+		self._accbits = accbits
+		self._bitlen += bitcount
+
+	def copy(self):
+		clone = copy.copy(self)
+		clone._data = bytearray(self._data)
+		return clone
+
+	@property
+	def buffered(self):
+		# Complete bytes that have not been taken yet
+		return self._data
+
+	def take(self, count: int | None = None):
+		if count is None:
+			count = len(self._data)
+		result = bytes(self._data[:count])
+		del self._data[:count]
+		self._taken_bytes += count
+		return result
+
+	def finish(self):
+		if self._accbits > 0:
+			self._data.append(_REVERSE_BITS[self._acc])
+			self._acc = 0
+			self._accbits = 0
+		result = bytes(self._data)
+		self._taken_bytes += len(self._data)
+		self._data.clear()
+		return result
+
+	def to_bitstring(self):
+		bitlen = self.pending_bit_len
+		return BitString.from_bytes(self.finish(), bitlen)
@@ -0,0 +1,63 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import threading
+from .BitString import BitString
+from .LZString import LZStringCompressor, LZStringDecompressor, LZStringFormat
+from .DecompressionLimits import DecompressionLimits
+
+class CodecPool():
+	# Codec objects are not thread-safe themselves, so every thread gets its
+	# own pair which is reset and reused on each call.
+	def __init__(self, compressor_class: type = LZStringCompressor, decompressor_class: type = LZStringDecompressor):
+		self._compressor_class = compressor_class
+		self._decompressor_class = decompressor_class
+		self._local = threading.local()
+
+	@property
+	def compressor(self):
+		compressor = getattr(self._local, "compressor", None)
+		if compressor is None:
+			compressor = self._compressor_class()
+			self._local.compressor = compressor
+		return compressor
+
+	@property
+	def decompressor(self):
+		decompressor = getattr(self._local, "decompressor", None)
+		if decompressor is None:
+			decompressor = self._decompressor_class(BitString())
+			self._local.decompressor = decompressor
+		return decompressor
+
+	def reset(self):
+		self._local = threading.local()
+
+	def compress_to(self, data: bytes | str, output_format: LZStringFormat, observer = None):
+		return self._compressor_class._compress_to(data, LZStringFormat(output_format), observer, compressor = self.compressor)
+
+	def decompress_from(self, encoded: bytes | str, input_format: LZStringFormat, as_text: bool = False, observer = None, limits: DecompressionLimits | None = None, prefix: int | None = None):
+		decompressor = self.decompressor
+		try:
+			return self._decompressor_class._decompress_from(encoded, LZStringFormat(input_format), as_text, observer, limits, prefix, decompressor = decompressor)
+		finally:
+			# Do not keep the input or output alive until the next call
+			decompressor.reset(None)
@@ -0,0 +1,61 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import dataclasses
+
+@dataclasses.dataclass
+class CodecStatistics():
+	operation: str
+	uncompressed_len: int
+	bit_len: int
+	tokens: int
+	literal_bytes: int
+	literal_words: int
+	dictionary_size: int
+	max_token_bits: int
+	format: str | None = None
+	encoded_len: int | None = None
+	lz_seconds: float | None = None
+	codec_seconds: float | None = None
+
+	@property
+	def literals(self):
+		return self.literal_bytes + self.literal_words
+
+	@property
+	def dictionary_references(self):
+		# All tokens except the literals and the final EndOfStream
+		return self.tokens - self.literals - 1
+
+	@property
+	def bits_per_symbol(self):
+		if self.uncompressed_len == 0:
+			return None
+		return self.bit_len / self.uncompressed_len
+
+	def to_dict(self):
+		result = dataclasses.asdict(self)
+		result.update({
+			"literals": self.literals,
+			"dictionary_references": self.dictionary_references,
+			"bits_per_symbol": self.bits_per_symbol,
+		})
+		return result
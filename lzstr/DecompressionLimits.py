@@ -0,0 +1,54 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import sys
+import dataclasses
+from .Exceptions import LZStringTruncatedInputException, LZStringOutputLimitException, LZStringDictionaryLimitException, LZStringInputLimitException
+
+@dataclasses.dataclass(frozen = True)
+class DecompressionLimits():
+	max_output: int | None = None
+	max_dictionary: int | None = None
+	max_input_bits: int | None = None
+
+	def _bound(self, value: int | None):
+		return sys.maxsize if (value is None) else value
+
+	def unpack(self, available_bits: int = sys.maxsize):
+		# The tightest bound on the input position, the hot loops then only need
+		# a single comparison per token
+		return (self._bound(self.max_output), self._bound(self.max_dictionary), min(available_bits, self._bound(self.max_input_bits)))
+
+	def check_output(self, output_len: int):
+		if (self.max_output is not None) and (output_len > self.max_output):
+			raise LZStringOutputLimitException(f"decompressed output would exceed the limit of {self.max_output} symbols")
+
+	def check_dictionary(self, dict_len: int):
+		if (self.max_dictionary is not None) and (dict_len > self.max_dictionary):
+			raise LZStringDictionaryLimitException(f"dictionary would exceed the limit of {self.max_dictionary} entries")
+
+	def check_input(self, position: int, available_bits: int = sys.maxsize):
+		if (self.max_input_bits is not None) and (position > self.max_input_bits):
+			raise LZStringInputLimitException(f"decompression would consume more than the limit of {self.max_input_bits} input bits")
+		if position > available_bits:
+			raise LZStringTruncatedInputException(f"input truncated, tried to read up to bit {position} of {available_bits} bits")
+
+DecompressionLimits.Unlimited = DecompressionLimits()
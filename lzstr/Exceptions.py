@@ -20,3 +20,8 @@
 #	Johannes Bauer <JohannesBauer@gmx.de>
 
 class LZStringDecompressionException(Exception): pass
+class LZStringTruncatedInputException(LZStringDecompressionException): pass
+class LZStringLimitExceededException(LZStringDecompressionException): pass
+class LZStringOutputLimitException(LZStringLimitExceededException): pass
+class LZStringDictionaryLimitException(LZStringLimitExceededException): pass
+class LZStringInputLimitException(LZStringLimitExceededException): pass
@@ -0,0 +1,110 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import time
+import threading
+import collections
+
+class LRUCache():
+	def __init__(self, max_entries: int = 1024, max_bytes: int | None = None, ttl: float | None = None, clock = time.monotonic):
+		self._max_entries = max_entries
+		self._max_bytes = max_bytes
+		self._ttl = ttl
+		self._clock = clock
+		self._lock = threading.Lock()
+		self._entries = collections.OrderedDict()
+		self._total_bytes = 0
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+		self._expirations = 0
+
+	@property
+	def total_bytes(self):
+		return self._total_bytes
+
+	@property
+	def hits(self):
+		return self._hits
+
+	@property
+	def misses(self):
+		return self._misses
+
+	@property
+	def evictions(self):
+		return self._evictions
+
+	@property
+	def expirations(self):
+		return self._expirations
+
+	def _remove(self, key):
+		(value, size, expires) = self._entries.pop(key)
+		self._total_bytes -= size
+
+	def get(self, key):
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self._misses += 1
+				return None
+			(value, size, expires) = entry
+			if (expires is not None) and (self._clock() >= expires):
+				self._remove(key)
+				self._expirations += 1
+				self._misses += 1
+				return None
+			self._entries.move_to_end(key)
+			self._hits += 1
+			return value
+
+	def put(self, key, value, size: int):
+		if (self._max_bytes is not None) and (size > self._max_bytes):
+			return
+		expires = None if (self._ttl is None) else (self._clock() + self._ttl)
+		with self._lock:
+			if key in self._entries:
+				self._remove(key)
+			self._entries[key] = (value, size, expires)
+			self._total_bytes += size
+			while (len(self._entries) > self._max_entries) or ((self._max_bytes is not None) and (self._total_bytes > self._max_bytes)):
+				self._remove(next(iter(self._entries)))
+				self._evictions += 1
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self._total_bytes = 0
+
+	def statistics(self):
+		with self._lock:
+			return {
+				"entries": len(self._entries),
+				"total_bytes": self._total_bytes,
+				"hits": self._hits,
+				"misses": self._misses,
+				"evictions": self._evictions,
+				"expirations": self._expirations,
+			}
+
+	def __len__(self):
+		return len(self._entries)
@@ -19,8 +19,20 @@
 #
 #	Johannes Bauer <JohannesBauer@gmx.de>
 
+import sys
+import copy
 import enum
-from .BitString import BitString
+import time
+import dataclasses
+import array
+from .BitString import BitString, _REVERSE_BITS
+from .BitWriter import BitWriter
+from .BitReader import BitReader
+from .SixBitAlphabet import SixBitAlphabet
+from .StreamFormat import BytesFormat, Uint8ArrayFormat, RawStringFormat, UTF16Format, code_units, from_code_units
+from .CodecStatistics import CodecStatistics
+from .ScanResult import ScanResult
+from .DecompressionLimits import DecompressionLimits
 from .Exceptions import LZStringDecompressionException
 
 class SpecialTokens(enum.IntEnum):
@@ -28,125 +40,809 @@ class SpecialTokens(enum.IntEnum):
 	LiteralWord = 1
 	EndOfStream = 2
 
+class LZStringFormat(enum.Enum):
+	Bytes = "bytes"
+	Base64 = "base64"
+	URIComponent = "uri"
+	UTF16 = "utf16"
+	Uint8Array = "uint8array"
+	RawString = "raw"
+
+	def encoded_len(self, bit_len: int):
+		return _FORMAT_CODECS[self].encoded_len(bit_len)
+
+_FORMAT_CODECS = {
+	LZStringFormat.Bytes: BytesFormat(),
+	LZStringFormat.Base64: SixBitAlphabet.Base64,
+	LZStringFormat.URIComponent: SixBitAlphabet.URIComponent,
+	LZStringFormat.UTF16: UTF16Format(),
+	LZStringFormat.Uint8Array: Uint8ArrayFormat(),
+	LZStringFormat.RawString: RawStringFormat(),
+}
+
+def _iter_chunks(source, chunk_size: int):
+	if hasattr(source, "read"):
+		while len(chunk := source.read(chunk_size)) > 0:
+			yield chunk
+	else:
+		yield from source
+
+def _decode_input(encoded: bytes | str, input_format: LZStringFormat):
+	if input_format in [ LZStringFormat.Bytes, LZStringFormat.Uint8Array ]:
+		return BitString.from_buffer(encoded)
+	return BitString.from_format(encoded, _FORMAT_CODECS[input_format])
+
+class _DecoderState():
+	def __init__(self, result: bytearray | array.array):
+		# Every dictionary entry is a substring of the output decoded so far,
+		# so it is stored as (offset, length) into the result buffer.
+		self.result = result
+		self.offsets = array.array("q", [ 0, 0, 0 ])
+		self.lengths = array.array("q", [ 0, 0, 0 ])
+		self.last_offset = 0
+		self.last_length = 0
+		self.literal_bytes = 0
+		self.literal_words = 0
+		self.position = 0
+		self.finished = False
+
 class LZStringDecompressor():
-	def __init__(self, bs: BitString):
-		self._bs = bs
-		self._result = None
+	observer = None
+	cache = None
+	limits = DecompressionLimits.Unlimited
 
-	def decompress(self):
-		if self._result is not None:
-			return self._result
+	def __init__(self, bs: BitString, limits: DecompressionLimits | None = None):
+		self._states = { }
+		self.reset(bs, limits = limits)
 
-		self._bs.seek(0)
-		cdict = { i: None for i in range(3) }
+	def reset(self, bs: BitString, limits: DecompressionLimits | None = None):
+		# Decoder states hold the returned output, so they are not recycled
+		self._bs = bs
+		self._limits = limits or self.limits
+		self._states.clear()
+		self._text_result = None
+		self._statistics = None
 
-		self._result = bytearray()
-		last_data = None
+	@staticmethod
+	def _decode_tokens(bs: BitReader, limits: DecompressionLimits, result: bytearray):
+		# Appends to result and yields after every token. Dictionary entries
+		# and the order of the limit checks are the same as in _decode(), but
+		# the input is a forward-only BitReader instead of a BitString, so the
+		# register loop of _decode() (which reads ahead a whole word at any
+		# position and knows the input length up front) cannot be used here.
+		(max_output, max_dictionary, max_input_bits) = limits.unpack()
+		offsets = array.array("q", [ 0, 0, 0 ])
+		lengths = array.array("q", [ 0, 0, 0 ])
+		last_offset = 0
+		last_length = 0
 		while True:
-			token_bits = len(cdict).bit_length()
-			token = self._bs.read_bits(token_bits)
-			if token in [ SpecialTokens.LiteralByte, SpecialTokens.LiteralWord ]:
-				data = bytes(self._bs.read_chars(token + 1))
-				cdict[len(cdict)] = data
+			dict_len = len(offsets)
+			if dict_len > max_dictionary:
+				limits.check_dictionary(dict_len)
+			token = bs.read_bits(dict_len.bit_length())
+			if bs.bits_read > max_input_bits:
+				limits.check_input(bs.bits_read)
+			offset = len(result)
+			if (token == SpecialTokens.LiteralByte) or (token == SpecialTokens.LiteralWord):
+				length = token + 1
+				if offset + length > max_output:
+					limits.check_output(offset + length)
+				literal = bs.read_chars(length)
+				if bs.bits_read > max_input_bits:
+					limits.check_input(bs.bits_read)
+				result += literal
+				offsets.append(offset)
+				lengths.append(length)
 			elif token == SpecialTokens.EndOfStream:
-				return self._result
+				return
+			elif token < dict_len:
+				entry_offset = offsets[token]
+				length = lengths[token]
+				if offset + length > max_output:
+					limits.check_output(offset + length)
+				result += result[entry_offset : entry_offset + length]
+			elif (token == dict_len) and (last_length > 0):
+				length = last_length + 1
+				if offset + length > max_output:
+					limits.check_output(offset + length)
+				result += result[last_offset : offset]
+				result.append(result[last_offset])
 			else:
-				if token in cdict:
-					data = cdict[token]
-				elif token == len(cdict):
-					data = last_data + bytearray([ last_data[0] ])
+				raise LZStringDecompressionException(f"token {token} is not in compression dictionary of {dict_len} entries")
+
+			if last_length > 0:
+				offsets.append(last_offset)
+				lengths.append(last_length + 1)
+			last_offset = offset
+			last_length = length
+			yield
+
+	def _decompress(self, word_units: bool, stop_at: int = sys.maxsize):
+		state = self._states.get(word_units)
+		if state is None:
+			state = _DecoderState(array.array("H") if word_units else bytearray())
+			self._states[word_units] = state
+		if state.finished or (len(state.result) >= stop_at):
+			return state
+
+		# The result is grown ahead of the decoder and trimmed to the decoded
+		# length afterwards. A failed decode leaves the state half updated, so
+		# it is dropped and a later call starts over.
+		result = state.result
+		zero = result[:0]
+		zero.append(0)
+		limits = self._limits
+		def grow(target, output_len: int):
+			limits.check_output(output_len)
+			result.extend(zero * (max(output_len, 2 * len(result)) - len(result)))
+			return result
+		try:
+			offset = self._decode(state, result, len(result), grow, word_units, stop_at)
+		except BaseException:
+			del self._states[word_units]
+			raise
+		del result[offset:]
+		return state
+
+	def _decode(self, state: _DecoderState, target, offset: int, grow, word_units: bool, stop_at: int):
+		# Decodes tokens into target, which is written by index and slice
+		# assignment from the given offset on. When the next output would not
+		# fit, grow(target, output_len) has to return a target large enough or
+		# raise. Returns the output length.
+		bs = self._bs
+		read_word = bs.read_word
+		# Tokens are taken from a bit register that is refilled a word at a
+		# time straight from the decoded input, LSB-first. The register always
+		# ends at a byte boundary of the input.
+		position = state.position
+		bit_shift = position & 7
+		acc = read_word(position >> 3) >> bit_shift
+		accbits = 64 - bit_shift
+		offsets = state.offsets
+		lengths = state.lengths
+		last_offset = state.last_offset
+		last_length = state.last_length
+		literal_bytes = state.literal_bytes
+		literal_words = state.literal_words
+		limits = self._limits
+		(max_output, max_dictionary, max_position) = limits.unpack(available_bits = bs.bit_len)
+		capacity = min(len(target), max_output)
+		while offset < stop_at:
+			dict_len = len(offsets)
+			if dict_len > max_dictionary:
+				limits.check_dictionary(dict_len)
+			token_bits = dict_len.bit_length()
+			if accbits < 16 + token_bits:
+				# Enough for the token and a subsequent literal
+				acc |= read_word((position + accbits) >> 3) << accbits
+				accbits += 64
+			token = acc & ((1 << token_bits) - 1)
+			acc >>= token_bits
+			accbits -= token_bits
+			position += token_bits
+			if position > max_position:
+				limits.check_input(position, available_bits = bs.bit_len)
+			if token == SpecialTokens.LiteralByte:
+				length = 1
+				if offset + length > capacity:
+					target = grow(target, offset + length)
+					capacity = min(len(target), max_output)
+				position += 8
+				if position > max_position:
+					limits.check_input(position, available_bits = bs.bit_len)
+				target[offset] = acc & 0xff
+				acc >>= 8
+				accbits -= 8
+				offsets.append(offset)
+				lengths.append(length)
+				literal_bytes += 1
+			elif token == SpecialTokens.LiteralWord:
+				length = 1 if word_units else 2
+				if offset + length > capacity:
+					target = grow(target, offset + length)
+					capacity = min(len(target), max_output)
+				position += 16
+				if position > max_position:
+					limits.check_input(position, available_bits = bs.bit_len)
+				if word_units:
+					target[offset] = acc & 0xffff
 				else:
-					raise LZStringDecompressionException(f"token {token} is not in compression dictionary: {cdict}")
+					target[offset] = acc & 0xff
+					target[offset + 1] = (acc >> 8) & 0xff
+				acc >>= 16
+				accbits -= 16
+				offsets.append(offset)
+				lengths.append(length)
+				literal_words += 1
+			elif token == SpecialTokens.EndOfStream:
+				# Every token but the first one and EndOfStream adds an entry,
+				# literals add one more
+				tokens = (dict_len - 3 - literal_bytes - literal_words + 1) if (dict_len > 3) else 0
+				self._statistics = CodecStatistics(operation = "decompress", uncompressed_len = offset, bit_len = position, tokens = tokens + 1, literal_bytes = literal_bytes, literal_words = literal_words, dictionary_size = dict_len, max_token_bits = dict_len.bit_length())
+				state.finished = True
+				break
+			elif token < dict_len:
+				entry_offset = offsets[token]
+				length = lengths[token]
+				if offset + length > capacity:
+					target = grow(target, offset + length)
+					capacity = min(len(target), max_output)
+				target[offset : offset + length] = target[entry_offset : entry_offset + length]
+			elif (token == dict_len) and (last_length > 0):
+				length = last_length + 1
+				if offset + length > capacity:
+					target = grow(target, offset + length)
+					capacity = min(len(target), max_output)
+				target[offset : offset + last_length] = target[last_offset : offset]
+				target[offset + last_length] = target[last_offset]
+			else:
+				raise LZStringDecompressionException(f"token {token} is not in compression dictionary of {dict_len} entries")
+
+			if last_length > 0:
+				# The previous output immediately precedes the first character
+				# of the current one, so the new entry is a contiguous range.
+				offsets.append(last_offset)
+				lengths.append(last_length + 1)
+			last_offset = offset
+			last_length = length
+			offset += length
+
+		bs.seek(position)
+		state.position = position
+		state.last_offset = last_offset
+		state.last_length = last_length
+		state.literal_bytes = literal_bytes
+		state.literal_words = literal_words
+		return offset
+
+	def scan(self, as_text: bool = False):
+		# Walks the token stream tracking only the length of each dictionary
+		# entry. Corrupt or truncated input is reported instead of raised.
+		bs = self._bs
+		bs.seek(0)
+		available_bits = bs.bit_len
+		lengths = array.array("q", [ 0, 0, 0 ])
+		word_length = 1 if as_text else 2
+		output_len = 0
+		last_length = 0
+		tokens = 0
+		error = None
+		while True:
+			dict_len = len(lengths)
+			token = bs.read_bits(dict_len.bit_length())
+			if token == SpecialTokens.LiteralByte:
+				bs.seek(bs.tell() + 8)
+				length = 1
+			elif token == SpecialTokens.LiteralWord:
+				bs.seek(bs.tell() + 16)
+				length = word_length
+			elif token == SpecialTokens.EndOfStream:
+				length = 0
+			elif token < dict_len:
+				length = lengths[token]
+			elif (token == dict_len) and (last_length > 0):
+				length = last_length + 1
+			else:
+				error = f"token {token} is not in compression dictionary of {dict_len} entries"
+				break
+
+			if bs.tell() > available_bits:
+				error = f"input truncated, tried to read up to bit {bs.tell()} of {available_bits} bits"
+				break
+			tokens += 1
+			if token == SpecialTokens.EndOfStream:
+				break
+			if token < SpecialTokens.EndOfStream:
+				lengths.append(length)
+			if last_length > 0:
+				lengths.append(last_length + 1)
+			output_len += length
+			last_length = length
+		return ScanResult(uncompressed_len = output_len, tokens = tokens, bit_len = bs.tell(), dictionary_size = len(lengths), clean = error is None, error = error)
+
+	def decompress(self):
+		return self._decompress(word_units = False).result
+
+	def decompress_text(self):
+		if self._text_result is None:
+			self._text_result = from_code_units(self._decompress(word_units = True).result)
+		return self._text_result
+
+	def decompress_prefix(self, length: int, as_text: bool = False):
+		# Decoding stops at the first token that completes the prefix. The
+		# decompressor can be kept (or pickled) to continue from there later.
+		result = self._decompress(word_units = as_text, stop_at = length).result[:length]
+		return from_code_units(result) if as_text else bytes(result)
 
-			self._result += data
-			if last_data is not None:
-				cdict[len(cdict)] = bytes(last_data + bytes([ data[0] ]))
-			last_data = data
+	def decompress_into(self, buffer):
+		# Decodes straight into the caller's buffer, which cannot grow
+		def buffer_exhausted(target: memoryview, output_len: int):
+			self._limits.check_output(output_len)
+			raise ValueError(f"decompressed output does not fit into buffer of {len(target)} bytes")
+		with memoryview(buffer) as buffer_view, buffer_view.cast("B") as view:
+			return self._decode(_DecoderState(None), view, 0, buffer_exhausted, False, sys.maxsize)
+
+	def decompress_to(self, writer, as_text: bool = False, flush_size: int = 64 * 1024):
+		# Output is handed to the writer in batches of at least flush_size
+		# symbols while decoding continues
+		written = 0
+		stop_at = flush_size
+		while True:
+			state = self._decompress(word_units = as_text, stop_at = stop_at)
+			end = len(state.result)
+			stop_at = end + flush_size
+			if as_text:
+				if (not state.finished) and (end > written) and (0xd800 <= state.result[end - 1] < 0xdc00):
+					# Keep surrogate pairs in one piece
+					end -= 1
+				if end > written:
+					writer.write(from_code_units(state.result[written : end]))
+			elif end > written:
+				# A copy, as writers may keep the chunk while the result grows
+				writer.write(bytes(state.result[written : end]))
+			written = end
+			if state.finished:
+				return written
+
+	@property
+	def finished(self):
+		return any(state.finished for state in self._states.values())
+
+	@property
+	def statistics(self):
+		return self._statistics
 
 	@classmethod
-	def decompress_from_bytes(cls, data: bytes):
-		bitstring = BitString.from_bytes(data)
-		return cls(bitstring).decompress()
+	def decompress_chunks(cls, source, input_format: LZStringFormat = LZStringFormat.Bytes, chunk_size: int = 64 * 1024, limits: DecompressionLimits | None = None):
+		input_format = LZStringFormat(input_format)
+		chunks = _iter_chunks(source, chunk_size)
+		if input_format == LZStringFormat.Bytes:
+			chunks = ((chunk, 8 * len(chunk)) for chunk in chunks)
+		else:
+			chunks = _FORMAT_CODECS[input_format].decode_chunks(chunks)
+
+		# Dictionary entries refer back into the output, so all of it is kept
+		output = bytearray()
+		written = 0
+		for _ in cls._decode_tokens(BitReader(chunks), limits or cls.limits, output):
+			if len(output) - written >= chunk_size:
+				yield bytes(output[written : ])
+				written = len(output)
+		if len(output) > written:
+			yield bytes(output[written : ])
 
 	@classmethod
-	def decompress_from_base64(cls, b64data: str):
-		bitstring = BitString.from_base64(b64data)
-		return cls(bitstring).decompress()
+	def from_format(cls, encoded: bytes | str, input_format: LZStringFormat, limits: DecompressionLimits | None = None):
+		return cls(_decode_input(encoded, LZStringFormat(input_format)), limits = limits)
 
 	@classmethod
-	def decompress_from_url_component(cls, urlcomponent: str, escape = True):
+	def _decompress_from(cls, encoded: bytes | str, input_format: LZStringFormat, as_text: bool, observer, limits: DecompressionLimits | None, prefix: int | None, decompressor = None):
+		observer = observer or cls.observer
+		t0 = time.perf_counter()
+		if decompressor is None:
+			decompressor = cls.from_format(encoded, input_format, limits = limits)
+		else:
+			decompressor.reset(_decode_input(encoded, input_format), limits = limits)
+		t1 = time.perf_counter()
+		if prefix is not None:
+			result = decompressor.decompress_prefix(prefix, as_text = as_text)
+		else:
+			result = decompressor.decompress_text() if as_text else decompressor.decompress()
+		t2 = time.perf_counter()
+		if (observer is not None) and (decompressor.statistics is not None):
+			observer(dataclasses.replace(decompressor.statistics, format = input_format.value, encoded_len = len(encoded), lz_seconds = t2 - t1, codec_seconds = t1 - t0))
+		return result
+
+	@classmethod
+	def decompress_from(cls, encoded: bytes | str, input_format: LZStringFormat, as_text: bool = False, observer = None, limits: DecompressionLimits | None = None, prefix: int | None = None):
+		input_format = LZStringFormat(input_format)
+		cache = cls.cache
+		if cache is None:
+			return cls._decompress_from(encoded, input_format, as_text, observer, limits, prefix)
+
+		if not isinstance(encoded, (bytes, str)):
+			encoded = bytes(encoded)
+		key = ("decompress", input_format, as_text, limits or cls.limits, prefix, encoded)
+		result = cache.get(key)
+		if result is None:
+			result = cls._decompress_from(encoded, input_format, as_text, observer, limits, prefix)
+			if not as_text:
+				result = bytes(result)
+			cache.put(key, result, len(encoded) + len(result))
+		return result
+
+	@classmethod
+	def decompress_file(cls, filename: str, input_format: LZStringFormat = LZStringFormat.Bytes, as_text: bool = False, limits: DecompressionLimits | None = None, prefix: int | None = None, encoding: str = "utf-8"):
+		input_format = LZStringFormat(input_format)
+		if input_format in [ LZStringFormat.Bytes, LZStringFormat.Uint8Array ]:
+			decompressor = cls(BitString.from_file(filename), limits = limits)
+		else:
+			with open(filename, encoding = encoding, errors = "surrogatepass") as f:
+				decompressor = cls.from_format(f.read(), input_format, limits = limits)
+		if prefix is not None:
+			return decompressor.decompress_prefix(prefix, as_text = as_text)
+		return decompressor.decompress_text() if as_text else decompressor.decompress()
+
+	@classmethod
+	def scan_from(cls, encoded: bytes | str, input_format: LZStringFormat, as_text: bool = False):
+		return cls.from_format(encoded, input_format).scan(as_text = as_text)
+
+	@classmethod
+	def decompress_from_bytes(cls, data: bytes, as_text: bool = False, prefix: int | None = None):
+		return cls.decompress_from(data, LZStringFormat.Bytes, as_text = as_text, prefix = prefix)
+
+	@classmethod
+	def decompress_from_base64(cls, b64data: str, as_text: bool = False, prefix: int | None = None):
+		return cls.decompress_from(b64data, LZStringFormat.Base64, as_text = as_text, prefix = prefix)
+
+	@classmethod
+	def decompress_from_url_component(cls, urlcomponent: str, escape = True, as_text: bool = False, prefix: int | None = None):
 		if not escape:
 			urlcomponent = urlcomponent.replace(" ", "+")
-		bitstring = BitString.from_url_component(urlcomponent)
-		return cls(bitstring).decompress()
+		return cls.decompress_from(urlcomponent, LZStringFormat.URIComponent, as_text = as_text, prefix = prefix)
+
+	@classmethod
+	def decompress_from_utf16(cls, text: str, as_text: bool = False, prefix: int | None = None):
+		return cls.decompress_from(text, LZStringFormat.UTF16, as_text = as_text, prefix = prefix)
+
+	@classmethod
+	def decompress_from_uint8array(cls, data: bytes, as_text: bool = False, prefix: int | None = None):
+		return cls.decompress_from(data, LZStringFormat.Uint8Array, as_text = as_text, prefix = prefix)
+
+	@classmethod
+	def decompress_from_raw_string(cls, text: str, as_text: bool = False, prefix: int | None = None):
+		return cls.decompress_from(text, LZStringFormat.RawString, as_text = as_text, prefix = prefix)
 
 class LZStringCompressor():
-	def __init__(self, data: bytes):
+	# The dictionary is a trie flattened into a single dict: the entry that
+	# extends the pattern with code "parent" by "symbol" is found under the key
+	# (parent << 16) | symbol. Code 0 denotes the empty pattern, so the single
+	# symbol entries are keyed by the symbol itself. Symbols are bytes or,
+	# for str input, UTF-16 code units.
+	_EMPTY_PATTERN = 0
+	observer = None
+	cache = None
+
+	def __init__(self, data: bytes | str = b"", output_format: LZStringFormat = LZStringFormat.Bytes):
+		self._cdict = { }
+		self._not_emitted_yet = { }
+		self._writer = BitWriter()
+		self.reset(data, output_format)
+
+	def reset(self, data: bytes | str = b"", output_format: LZStringFormat | None = None):
+		# Returns the compressor to its initial state. The dictionary and buffer
+		# objects are kept, their storage is released by clearing them.
+		if output_format is not None:
+			self._output_format = LZStringFormat(output_format)
 		self._data = data
-		self._cdict = None
-		self._not_emitted_yet = set()
+		self._cdict.clear()
+		self._next_code = 3
+		self._not_emitted_yet.clear()
+		self._pattern = self._EMPTY_PATTERN
+		self._writer.reset()
+		self._fed = False
+		self._flushed = False
 		self._result = None
 		self._dictsize = 3
+		self._symbol_count = 0
+		self._literal_bytes = 0
+		self._literal_words = 0
 
 	@property
 	def token_bits(self):
 		token_bits = (self._dictsize - 1).bit_length()
 		return token_bits
 
-	def _emit(self, pattern: bytes):
-		if pattern in self._not_emitted_yet:
-			self._not_emitted_yet.remove(pattern)
-			self._result.append_value(SpecialTokens.LiteralByte, self.token_bits)
-			self._result.append_value(pattern[0], 8)
+	def _emit(self, pattern: int):
+		literal = self._not_emitted_yet.pop(pattern, None)
+		if literal is not None:
+			if literal <= 0xff:
+				self._writer.append_value(SpecialTokens.LiteralByte, self.token_bits)
+				self._writer.append_value(literal, 8)
+				self._literal_bytes += 1
+			else:
+				self._writer.append_value(SpecialTokens.LiteralWord, self.token_bits)
+				self._writer.append_value(literal, 16)
+				self._literal_words += 1
 			self._dictsize += 2
 		else:
-			self._result.append_value(self._cdict[pattern], self.token_bits)
+			self._writer.append_value(pattern, self.token_bits)
 			self._dictsize += 1
 
+	def _assert_not_flushed(self):
+		if self._flushed:
+			raise ValueError("Compressor has already been flushed.")
+
+	def _assert_not_fed(self):
+		if self._fed or (self._writer.taken_bytes > 0):
+			raise ValueError("Compressor has been fed data, finish it with flush().")
+
+	def _compress_chunk(self, data: bytes | str):
+		self._assert_not_flushed()
+		if isinstance(data, str):
+			data = code_units(data)
+		self._symbol_count += len(data)
+		cdict = self._cdict
+		not_emitted_yet = self._not_emitted_yet
+		next_code = self._next_code
+		pattern = self._pattern
+		dictsize = self._dictsize
+		literal_bytes = self._literal_bytes
+		literal_words = self._literal_words
+
+		# Tokens go straight into the writer's bit register, which is flushed
+		# to its buffer 64 bits at a time; this is _emit() inlined.
+		writer = self._writer
+		output = writer._data
+		acc = writer._acc
+		accbits = writer._accbits
+		bitlen = writer._bitlen
+		for symbol in data:
+			if symbol not in cdict:
+				not_emitted_yet[next_code] = symbol
+				cdict[symbol] = next_code
+				next_code += 1
+
+			key = (pattern << 16) | symbol
+			combined_pattern = cdict.get(key)
+			if combined_pattern is not None:
+				pattern = combined_pattern
+			else:
+				token_bits = (dictsize - 1).bit_length()
+				literal = not_emitted_yet.pop(pattern, None)
+				if literal is None:
+					acc |= pattern << accbits
+					accbits += token_bits
+					bitlen += token_bits
+					dictsize += 1
+				elif literal <= 0xff:
+					acc |= ((literal << token_bits) | SpecialTokens.LiteralByte) << accbits
+					accbits += token_bits + 8
+					bitlen += token_bits + 8
+					dictsize += 2
+					literal_bytes += 1
+				else:
+					acc |= ((literal << token_bits) | SpecialTokens.LiteralWord) << accbits
+					accbits += token_bits + 16
+					bitlen += token_bits + 16
+					dictsize += 2
+					literal_words += 1
+				if accbits >= 64:
+					output += (acc & 0xffffffffffffffff).to_bytes(8, "little").translate(_REVERSE_BITS)
+					acc >>= 64
+					accbits -= 64
+				cdict[key] = next_code
+				next_code += 1
+				pattern = cdict[symbol]
+		while accbits >= 8:
+			output.append(_REVERSE_BITS[acc & 0xff])
+			acc >>= 8
+			accbits -= 8
+		writer._acc = acc
+		writer._accbits = accbits
+		writer._bitlen = bitlen
+
+		self._next_code = next_code
+		self._pattern = pattern
+		self._dictsize = dictsize
+		self._literal_bytes = literal_bytes
+		self._literal_words = literal_words
+
+	def _finish(self):
+		self._assert_not_flushed()
+		if self._pattern != self._EMPTY_PATTERN:
+			self._emit(self._pattern)
+		self._writer.append_value(SpecialTokens.EndOfStream, self.token_bits)
+		self._cdict.clear()
+		self._not_emitted_yet.clear()
+		self._flushed = True
+
+	def _copy(self):
+		clone = copy.copy(self)
+		clone._cdict = self._cdict.copy()
+		clone._not_emitted_yet = self._not_emitted_yet.copy()
+		clone._writer = self._writer.copy()
+		return clone
+
+	def _take_output(self, final: bool):
+		codec = _FORMAT_CODECS[self._output_format]
+		if final:
+			bitlen = self._writer.pending_bit_len
+			return codec.encode_final(self._writer.finish(), bitlen)
+		else:
+			# The remainder that cannot be encoded on its own yet is kept until
+			# the next call
+			data = self._writer.take(codec.encodable_len(self._writer.buffered))
+			return codec.encode(data, 8 * len(data))
+
+	@property
+	def statistics(self):
+		if not self._flushed:
+			return None
+		# Literals grow the dictionary by two, references by one
+		literals = self._literal_bytes + self._literal_words
+		references = self._dictsize - 3 - (2 * literals)
+		return CodecStatistics(operation = "compress", uncompressed_len = self._symbol_count, bit_len = self._writer.bit_len, tokens = literals + references + 1, literal_bytes = self._literal_bytes, literal_words = self._literal_words, dictionary_size = self._dictsize, max_token_bits = self.token_bits)
+
+	def feed(self, data: bytes | str):
+		self._compress_chunk(data)
+		self._fed = True
+		return self._take_output(final = False)
+
+	def flush(self):
+		self._finish()
+		return self._take_output(final = True)
+
+	def snapshot(self):
+		# Output that feed() has already returned would be missing from what
+		# the snapshot produces
+		self._assert_not_flushed()
+		if self._writer.taken_bytes > 0:
+			raise ValueError("Compressor has already returned output, cannot snapshot.")
+		return LZStringCompressorSnapshot(self._copy())
+
+	@classmethod
+	def snapshot_prefix(cls, prefix: bytes | str, output_format: LZStringFormat = LZStringFormat.Bytes):
+		compressor = cls(output_format = output_format)
+		compressor._compress_chunk(prefix)
+		return compressor.snapshot()
+
 	def compress(self):
 		if self._result is not None:
 			return self._result
 
-		self._result = BitString()
-		self._cdict = { }
-
-		pattern = b""
-		for substring in self._data:
-			substring = bytes([ substring ])
+		self._assert_not_fed()
+		self._compress_chunk(self._data)
+		self._finish()
+		self._result = self._writer.to_bitstring()
+		return self._result
 
-			if substring not in self._cdict:
-				self._not_emitted_yet.add(substring)
-				self._cdict[substring] = len(self._cdict) + 3
+	@classmethod
+	def compressed_bit_len(cls, data: bytes | str, max_bits: int | None = None):
+		# The parse of _compress_chunk() and _finish(), only counting the bits
+		# that would be written. Gives up with None as soon as the output is
+		# known to exceed max_bits.
+		if isinstance(data, str):
+			data = code_units(data)
+		if max_bits is None:
+			max_bits = sys.maxsize
+		cdict = { }
+		not_emitted_yet = { }
+		next_code = 3
+		pattern = cls._EMPTY_PATTERN
+		dictsize = 3
+		bitlen = 0
+		for symbol in data:
+			if symbol not in cdict:
+				not_emitted_yet[next_code] = symbol
+				cdict[symbol] = next_code
+				next_code += 1
 
-			combined_pattern = pattern + substring
-			if combined_pattern in self._cdict:
+			key = (pattern << 16) | symbol
+			combined_pattern = cdict.get(key)
+			if combined_pattern is not None:
 				pattern = combined_pattern
 			else:
-				self._emit(pattern)
-				self._cdict[combined_pattern] = len(self._cdict) + 3
-				pattern = substring
+				bitlen += (dictsize - 1).bit_length()
+				literal = not_emitted_yet.pop(pattern, None)
+				if literal is None:
+					dictsize += 1
+				else:
+					bitlen += 8 if (literal <= 0xff) else 16
+					dictsize += 2
+				if bitlen > max_bits:
+					return None
+				cdict[key] = next_code
+				next_code += 1
+				pattern = cdict[symbol]
 
-		if len(pattern) > 0:
-			self._emit(pattern)
+		if pattern != cls._EMPTY_PATTERN:
+			bitlen += (dictsize - 1).bit_length()
+			literal = not_emitted_yet.pop(pattern, None)
+			if literal is not None:
+				bitlen += 8 if (literal <= 0xff) else 16
+				dictsize += 2
+			else:
+				dictsize += 1
+		bitlen += (dictsize - 1).bit_length()
+		return bitlen if (bitlen <= max_bits) else None
 
-		self._result.append_value(SpecialTokens.EndOfStream, self.token_bits)
-		self._cdict = None
-		return self._result
+	@classmethod
+	def compressed_size(cls, data: bytes | str, output_format: LZStringFormat = LZStringFormat.Bytes, budget: int | None = None):
+		codec = _FORMAT_CODECS[LZStringFormat(output_format)]
+		if budget is None:
+			bitlen = cls.compressed_bit_len(data)
+		else:
+			max_bits = codec.max_bit_len(budget)
+			bitlen = cls.compressed_bit_len(data, max_bits = max_bits) if (max_bits >= 0) else None
+		return None if (bitlen is None) else codec.encoded_len(bitlen)
 
 	@classmethod
-	def compress_to_bytes(cls, data: bytes):
-		bitstring = cls(data).compress()
-		return bytes(bitstring)
+	def compress_chunks(cls, chunks, output_format: LZStringFormat = LZStringFormat.Bytes):
+		compressor = cls(output_format = output_format)
+		for chunk in chunks:
+			output = compressor.feed(chunk)
+			if len(output) > 0:
+				yield output
+		yield compressor.flush()
 
 	@classmethod
-	def compress_to_base64(cls, data: bytes):
-		bitstring = cls(data).compress()
-		return bitstring.to_base64()
+	def _compress_to(cls, data: bytes | str, output_format: LZStringFormat, observer, compressor = None):
+		if compressor is None:
+			compressor = cls(output_format = output_format)
+		else:
+			compressor.reset(output_format = output_format)
+		observer = observer or cls.observer
+		if observer is None:
+			compressor._compress_chunk(data)
+			return compressor.flush()
+
+		t0 = time.perf_counter()
+		compressor._compress_chunk(data)
+		compressor._finish()
+		t1 = time.perf_counter()
+		result = compressor._take_output(final = True)
+		t2 = time.perf_counter()
+		observer(dataclasses.replace(compressor.statistics, format = compressor._output_format.value, encoded_len = len(result), lz_seconds = t1 - t0, codec_seconds = t2 - t1))
+		return result
 
 	@classmethod
-	def compress_to_url_component(cls, data: bytes, escape = True):
-		bitstring = cls(data).compress()
-		result = bitstring.to_url_component()
+	def compress_to(cls, data: bytes | str, output_format: LZStringFormat, observer = None):
+		output_format = LZStringFormat(output_format)
+		cache = cls.cache
+		if cache is None:
+			return cls._compress_to(data, output_format, observer)
+
+		if not isinstance(data, (bytes, str)):
+			data = bytes(data)
+		key = ("compress", output_format, data)
+		result = cache.get(key)
+		if result is None:
+			result = cls._compress_to(data, output_format, observer)
+			cache.put(key, result, len(data) + len(result))
+		return result
+
+	@classmethod
+	def compress_to_bytes(cls, data: bytes | str):
+		return cls.compress_to(data, LZStringFormat.Bytes)
+
+	@classmethod
+	def compress_to_base64(cls, data: bytes | str):
+		return cls.compress_to(data, LZStringFormat.Base64)
+
+	@classmethod
+	def compress_to_url_component(cls, data: bytes | str, escape = True):
+		result = cls.compress_to(data, LZStringFormat.URIComponent)
 		if not escape:
 			result = result.replace("+", " ")
 		return result
+
+	@classmethod
+	def compress_to_utf16(cls, data: bytes | str):
+		return cls.compress_to(data, LZStringFormat.UTF16)
+
+	@classmethod
+	def compress_to_uint8array(cls, data: bytes | str):
+		return cls.compress_to(data, LZStringFormat.Uint8Array)
+
+	@classmethod
+	def compress_to_raw_string(cls, data: bytes | str):
+		return cls.compress_to(data, LZStringFormat.RawString)
+
+class LZStringCompressorSnapshot():
+	# The compressor is deterministic, so its state after a common prefix can
+	# be captured once and copied for every payload that starts with it.
+	def __init__(self, compressor: LZStringCompressor):
+		self._compressor = compressor
+
+	@property
+	def symbol_count(self):
+		return self._compressor._symbol_count
+
+	def fork(self):
+		return self._compressor._copy()
+
+	def compress_to(self, suffix: bytes | str):
+		compressor = self.fork()
+		compressor._compress_chunk(suffix)
+		return compressor.flush()
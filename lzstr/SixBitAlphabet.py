@@ -0,0 +1,68 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import re
+import binascii
+from .StreamFormat import StreamFormat
+
+class SixBitAlphabet(StreamFormat):
+	# LZString fills its bit stream MSB-first, so the packed bytes are exactly
+	# the payload of a standard base64 encoding. Other alphabets are mapped
+	# onto the standard one and the heavy lifting is left to binascii.
+	_STANDARD_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+	group_bytes = 3
+	group_symbols = 4
+	symbol_bits = 6
+	empty = ""
+
+	def __init__(self, alphabet: str):
+		assert(len(alphabet) == 64)
+		assert(len(set(alphabet)) == 64)
+		self._alphabet = alphabet
+		self._valid_prefix = re.compile("[" + re.escape(alphabet) + "]*")
+		self._to_standard = { ord(char): ord(std_char) for (char, std_char) in zip(alphabet, self._STANDARD_ALPHABET) if char != std_char } or None
+		self._from_standard = { ord(std_char): ord(char) for (char, std_char) in zip(alphabet, self._STANDARD_ALPHABET) if char != std_char } or None
+
+	@property
+	def alphabet(self):
+		return self._alphabet
+
+	def decode(self, text: str):
+		text = self._valid_prefix.match(text).group(0)
+		char_count = len(text)
+		if self._to_standard is not None:
+			text = text.translate(self._to_standard)
+		if (char_count % 4) != 0:
+			text += "A" * (4 - (char_count % 4))
+		bitlen = 6 * char_count
+		data = bytearray(binascii.a2b_base64(text))
+		del data[(bitlen + 7) // 8 : ]
+		return (data, bitlen)
+
+	def encode(self, data: bytes, bitlen: int):
+		char_count = (bitlen + 5) // 6
+		text = binascii.b2a_base64(data, newline = False)[:char_count].decode("ascii")
+		if self._from_standard is not None:
+			text = text.translate(self._from_standard)
+		return text
+
+SixBitAlphabet.Base64 = SixBitAlphabet("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")
+SixBitAlphabet.URIComponent = SixBitAlphabet("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-")
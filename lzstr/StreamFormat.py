@@ -0,0 +1,240 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import re
+import sys
+import array
+
+_numpy = None
+
+_UTF16_NATIVE = "utf-16-le" if (sys.byteorder == "little") else "utf-16-be"
+
+def _load_numpy():
+	# Importing NumPy takes tens of milliseconds, so it is only done once a
+	# payload is large enough to need it. Returns False when not installed.
+	global _numpy
+	if _numpy is None:
+		try:
+			import numpy
+			_numpy = numpy
+		except ImportError:
+			_numpy = False
+	return _numpy
+
+def code_units(text: str):
+	return memoryview(text.encode(_UTF16_NATIVE, "surrogatepass")).cast("H")
+
+def from_code_units(units: array.array):
+	return units.tobytes().decode(_UTF16_NATIVE, "surrogatepass")
+
+class StreamFormat():
+	# Maps the MSB-first packed bit stream onto a wire representation. The
+	# encoding works on whole groups of group_bytes bytes, which correspond to
+	# group_symbols symbols of the wire format of symbol_bits each.
+	#
+	# Note that the JavaScript implementation always terminates its output
+	# with one more symbol, even when the bit stream ends on a symbol
+	# boundary. The formats that only exist for compatibility with it do the
+	# same in encode_final().
+	group_bytes = 1
+	group_symbols = 1
+	symbol_bits = 8
+	empty = b""
+
+	def decode(self, encoded):
+		raise NotImplementedError()
+
+	def encode(self, data: bytes, bitlen: int):
+		raise NotImplementedError()
+
+	def encode_final(self, data: bytes, bitlen: int):
+		return self.encode(data, bitlen)
+
+	def encodable_len(self, data: bytes):
+		# Leading bytes that encode() can convert without the data following
+		# them, only whole groups map onto an integral number of symbols
+		return len(data) - (len(data) % self.group_bytes)
+
+	def encoded_len(self, bitlen: int):
+		# Length of encode_final() output, in bytes or UTF-16 code units
+		return (bitlen + self.symbol_bits - 1) // self.symbol_bits
+
+	def max_bit_len(self, encoded_len: int):
+		# Longest bit stream for which encoded_len() does not exceed the given
+		# length, -1 if there is none
+		return self.symbol_bits * encoded_len
+
+	def decode_chunks(self, chunks):
+		# Yields (data, bitlen) tuples, only the last one may end in padding
+		# bits that are not part of the stream
+		pending = self.empty
+		for chunk in chunks:
+			encoded = pending + chunk
+			usable = len(encoded) - (len(encoded) % self.group_symbols)
+			(data, bitlen) = self.decode(encoded[:usable])
+			yield (data, bitlen)
+			if bitlen < self.symbol_bits * usable:
+				# Decoding stopped at an invalid symbol, i.e., the end of input
+				return
+			pending = encoded[usable:]
+		yield self.decode(pending)
+
+class BytesFormat(StreamFormat):
+	def decode(self, encoded: bytes):
+		return (bytearray(encoded), 8 * len(encoded))
+
+	def encode(self, data: bytes, bitlen: int):
+		return bytes(data)
+
+def _pad_to_words(data: bytes, bitlen: int):
+	byte_count = 2 * ((bitlen // 16) + 1)
+	return bytes(data) + bytes(byte_count - len(data))
+
+class Uint8ArrayFormat(BytesFormat):
+	# JavaScript's compressToUint8Array(), whole 16-bit words.
+	group_bytes = 2
+
+	def encode_final(self, data: bytes, bitlen: int):
+		return _pad_to_words(data, bitlen)
+
+	def encoded_len(self, bitlen: int):
+		return 2 * ((bitlen // 16) + 1)
+
+	def max_bit_len(self, encoded_len: int):
+		return 16 * (encoded_len // 2) - 1
+
+class RawStringFormat(StreamFormat):
+	# JavaScript's compress(), 16 bits per UTF-16 code unit.
+	group_bytes = 2
+	symbol_bits = 16
+	empty = ""
+
+	def decode(self, encoded: str):
+		data = bytearray(encoded.encode("utf-16-be", "surrogatepass"))
+		return (data, 8 * len(data))
+
+	def encode(self, data: bytes, bitlen: int):
+		return data.decode("utf-16-be", "surrogatepass")
+
+	def encodable_len(self, data: bytes):
+		# A high surrogate may be followed by a low one, which then has to end
+		# up in the same str to form a single character
+		count = super().encodable_len(data)
+		if (count >= 2) and (0xd8 <= data[count - 2] < 0xdc):
+			count -= 2
+		return count
+
+	def encode_final(self, data: bytes, bitlen: int):
+		return self.encode(_pad_to_words(data, bitlen), bitlen)
+
+	def encoded_len(self, bitlen: int):
+		return (bitlen // 16) + 1
+
+	def max_bit_len(self, encoded_len: int):
+		return 16 * encoded_len - 1
+
+class UTF16Format(StreamFormat):
+	# JavaScript's compressToUTF16(), 15 bits per code unit offset by 32 and
+	# terminated by a space. Eight code units make up 15 bytes.
+	group_bytes = 15
+	group_symbols = 8
+	symbol_bits = 15
+	empty = ""
+
+	_VALID_PREFIX = re.compile("[\u0020-\u801f]*")
+
+	# Below this many code units the pure-Python implementation is fast
+	# enough that NumPy is not worth importing
+	_NUMPY_MIN_UNITS = 1024
+
+	def decode(self, encoded: str):
+		# Valid code units are never surrogates, so the valid prefix has as many
+		# characters as code units
+		unit_count = self._VALID_PREFIX.match(encoded).end()
+		units = code_units(encoded[:unit_count])
+		if unit_count == 0:
+			data = bytearray()
+		elif (unit_count >= self._NUMPY_MIN_UNITS) and _load_numpy():
+			data = self._decode_numpy(units)
+		else:
+			data = self._decode_python(units)
+		return (data, 15 * unit_count)
+
+	@staticmethod
+	def _decode_python(units: memoryview):
+		unit_count = len(units)
+		data = bytearray()
+		for offset in range(0, unit_count, 8):
+			value = 0
+			group = units[offset : offset + 8]
+			for unit in group:
+				value = (value << 15) | (unit - 32)
+			data += (value << (15 * (8 - len(group)))).to_bytes(15, "big")
+		del data[(15 * unit_count + 7) // 8 : ]
+		return data
+
+	@staticmethod
+	def _decode_numpy(units: memoryview):
+		numpy = _load_numpy()
+		values = numpy.frombuffer(units, dtype = numpy.uint16) - 32
+		bits = numpy.unpackbits(values.astype(">u2").view(numpy.uint8)).reshape(-1, 16)[:, 1:]
+		return bytearray(numpy.packbits(bits).tobytes())
+
+	def _encode(self, data: bytes, unit_count: int):
+		if unit_count == 0:
+			return ""
+		if (unit_count >= self._NUMPY_MIN_UNITS) and _load_numpy():
+			return self._encode_numpy(data, unit_count)
+		return self._encode_python(data, unit_count)
+
+	@staticmethod
+	def _encode_python(data: bytes, unit_count: int):
+		padded_len = 15 * ((unit_count + 7) // 8)
+		if len(data) < padded_len:
+			data = bytes(data) + bytes(padded_len - len(data))
+		units = array.array("H")
+		for offset in range(0, len(data), 15):
+			value = int.from_bytes(data[offset : offset + 15], "big")
+			units.extend(((value >> shift) & 0x7fff) + 32 for shift in range(105, -1, -15))
+		del units[unit_count : ]
+		return from_code_units(units)
+
+	@staticmethod
+	def _encode_numpy(data: bytes, unit_count: int):
+		numpy = _load_numpy()
+		stream = numpy.unpackbits(numpy.frombuffer(data, dtype = numpy.uint8))[: 15 * unit_count]
+		stream = numpy.concatenate((stream, numpy.zeros(15 * unit_count - len(stream), dtype = numpy.uint8)))
+		bits = numpy.zeros((unit_count, 16), dtype = numpy.uint8)
+		bits[:, 1:] = stream.reshape(unit_count, 15)
+		units = numpy.packbits(bits, axis = 1).view(">u2").reshape(-1).astype(numpy.uint16) + 32
+		return units.tobytes().decode(_UTF16_NATIVE, "surrogatepass")
+
+	def encode(self, data: bytes, bitlen: int):
+		return self._encode(data, (bitlen + 14) // 15)
+
+	def encode_final(self, data: bytes, bitlen: int):
+		return self._encode(data, (bitlen // 15) + 1) + " "
+
+	def encoded_len(self, bitlen: int):
+		return (bitlen // 15) + 2
+
+	def max_bit_len(self, encoded_len: int):
+		return 15 * (encoded_len - 1) - 1
@@ -20,7 +20,13 @@
 #	Johannes Bauer <JohannesBauer@gmx.de>
 
 from .BitString import BitString
-from .LZString import LZStringDecompressor, LZStringCompressor
-from .Exceptions import LZStringDecompressionException
+from .LZString import LZStringDecompressor, LZStringCompressor, LZStringCompressorSnapshot, LZStringFormat
+from .Exceptions import LZStringDecompressionException, LZStringTruncatedInputException, LZStringLimitExceededException, LZStringOutputLimitException, LZStringDictionaryLimitException, LZStringInputLimitException
+from .DecompressionLimits import DecompressionLimits
+from .CodecStatistics import CodecStatistics
+from .ScanResult import ScanResult
+from .LRUCache import LRUCache
+from .CodecPool import CodecPool
+from .Batch import compress_many, decompress_many
 
 VERSION = "0.0.4rc0"
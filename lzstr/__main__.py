@@ -0,0 +1,138 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import os
+import sys
+import time
+import argparse
+from .LZString import LZStringCompressor, LZStringDecompressor, LZStringFormat
+from .Batch import _run_many
+
+_CHUNK_SIZE = 1024 * 1024
+_FORMATS = [ LZStringFormat.Bytes, LZStringFormat.Base64, LZStringFormat.URIComponent ]
+
+def _is_binary(fmt: LZStringFormat):
+	return fmt == LZStringFormat.Bytes
+
+def _strip_whitespace(chunks):
+	# Text encodings are commonly line-wrapped or newline-terminated
+	for chunk in chunks:
+		yield "".join(chunk.split())
+
+def _read_chunks(f):
+	while len(chunk := f.read(_CHUNK_SIZE)) > 0:
+		yield chunk
+
+def _transcode(infile, outfile, decompress: bool, fmt: LZStringFormat):
+	if decompress:
+		chunks = _read_chunks(infile)
+		if not _is_binary(fmt):
+			chunks = _strip_whitespace(chunks)
+		output = LZStringDecompressor.decompress_chunks(chunks, fmt, chunk_size = _CHUNK_SIZE)
+	else:
+		output = LZStringCompressor.compress_chunks(_read_chunks(infile), fmt)
+
+	written = 0
+	for chunk in output:
+		outfile.write(chunk)
+		written += len(chunk)
+	if (not decompress) and (not _is_binary(fmt)):
+		outfile.write("\n")
+		written += 1
+	return written
+
+def _open_mode(mode: str, binary: bool):
+	return mode + "b" if binary else mode
+
+def _process_file(job):
+	(input_filename, output_filename, decompress, fmt, force) = job
+	if (not force) and os.path.exists(output_filename):
+		raise FileExistsError(f"{output_filename} already exists, use -f to overwrite")
+	t0 = time.perf_counter()
+	with open(input_filename, _open_mode("r", (not decompress) or _is_binary(fmt))) as infile, open(output_filename, _open_mode("w", decompress or _is_binary(fmt))) as outfile:
+		try:
+			written = _transcode(infile, outfile, decompress, fmt)
+		except BaseException:
+			outfile.close()
+			os.unlink(output_filename)
+			raise
+	t1 = time.perf_counter()
+	return (input_filename, output_filename, os.stat(input_filename).st_size, written, t1 - t0)
+
+def _output_filename(filename: str, decompress: bool, suffix: str):
+	if not decompress:
+		return filename + suffix
+	if (not filename.endswith(suffix)) or (len(filename) == len(suffix)):
+		raise ValueError(f"{filename} does not end in {suffix}, cannot determine output filename")
+	return filename[:-len(suffix)]
+
+def _process_stdio(decompress: bool, fmt: LZStringFormat):
+	infile = sys.stdin.buffer if (not decompress) or _is_binary(fmt) else sys.stdin
+	outfile = sys.stdout.buffer if decompress or _is_binary(fmt) else sys.stdout
+	try:
+		_transcode(infile, outfile, decompress, fmt)
+	finally:
+		outfile.flush()
+
+def main(argv: list | None = None):
+	parser = argparse.ArgumentParser(prog = "lzstr", description = "Compress or decompress files with LZString. Without file arguments, stdin is streamed to stdout.")
+	parser.add_argument("-d", "--decompress", action = "store_true", help = "Decompress instead of compress.")
+	parser.add_argument("-F", "--format", choices = [ fmt.value for fmt in _FORMATS ], default = LZStringFormat.Bytes.value, help = "Encoding of the compressed data. Defaults to %(default)s.")
+	parser.add_argument("-S", "--suffix", metavar = "suffix", default = ".lzs", help = "Suffix appended to compressed files and removed when decompressing. Defaults to %(default)s.")
+	parser.add_argument("-j", "--jobs", metavar = "count", type = int, default = 1, help = "Number of files to process in parallel. Defaults to %(default)d.")
+	parser.add_argument("-f", "--force", action = "store_true", help = "Overwrite existing output files.")
+	parser.add_argument("-q", "--quiet", action = "store_true", help = "Do not report timing and ratio of each file.")
+	parser.add_argument("filename", nargs = "*", help = "Files to process. Output is written next to each input file.")
+	args = parser.parse_args(argv)
+	if args.jobs < 1:
+		parser.error(f"argument -j/--jobs: must be at least 1, got {args.jobs}")
+	fmt = LZStringFormat(args.format)
+
+	if len(args.filename) == 0:
+		try:
+			_process_stdio(args.decompress, fmt)
+		except Exception as e:
+			print(f"lzstr: <stdin>: {e.__class__.__name__}: {e}", file = sys.stderr)
+			return 1
+		return 0
+
+	jobs = [ ]
+	failed = 0
+	for filename in args.filename:
+		try:
+			jobs.append((filename, _output_filename(filename, args.decompress, args.suffix), args.decompress, fmt, args.force))
+		except ValueError as e:
+			print(f"lzstr: {e}", file = sys.stderr)
+			failed += 1
+
+	for (job, result) in zip(jobs, _run_many(_process_file, jobs, processes = args.jobs, chunksize = 1, capture_errors = True)):
+		if isinstance(result, Exception):
+			print(f"lzstr: {job[0]}: {result.__class__.__name__}: {result}", file = sys.stderr)
+			failed += 1
+		elif not args.quiet:
+			(input_filename, output_filename, input_len, output_len, seconds) = result
+			(uncompressed, compressed) = (output_len, input_len) if args.decompress else (input_len, output_len)
+			ratio = compressed / uncompressed if (uncompressed > 0) else 1
+			print(f"{input_filename} -> {output_filename}: {uncompressed} / {compressed} bytes ({ratio * 100:.1f}%), {seconds:.3f} s", file = sys.stderr)
+	return 1 if (failed > 0) else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
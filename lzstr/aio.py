@@ -0,0 +1,157 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import asyncio
+import weakref
+import functools
+import concurrent.futures
+from .LZString import LZStringFormat
+from .Batch import _compress_one, _decompress_one
+
+class AsyncCodec():
+	def __init__(self, inline_threshold: int = 16 * 1024, max_workers: int | None = None, use_processes: bool = False, max_concurrency: int | None = None):
+		self._inline_threshold = inline_threshold
+		if use_processes:
+			self._executor = concurrent.futures.ProcessPoolExecutor(max_workers = max_workers)
+		else:
+			self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "lzstr")
+		self._max_concurrency = max_concurrency
+		self._semaphores = weakref.WeakKeyDictionary()
+
+	def _semaphore(self):
+		# Semaphores are bound to the event loop they are first used in
+		loop = asyncio.get_running_loop()
+		if loop not in self._semaphores:
+			self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+		return self._semaphores[loop]
+
+	async def _run(self, function, size: int):
+		if size < self._inline_threshold:
+			return function()
+		if self._max_concurrency is None:
+			return await asyncio.get_running_loop().run_in_executor(self._executor, function)
+		loop = asyncio.get_running_loop()
+		semaphore = self._semaphore()
+		await semaphore.acquire()
+		try:
+			future = self._executor.submit(function)
+		except BaseException:
+			semaphore.release()
+			raise
+		# Cancelling the await also cancels the work item if the executor has
+		# not started it yet. A running one cannot be stopped, so the slot is
+		# only released once the work item is done.
+		future.add_done_callback(lambda future: self._release(loop, semaphore))
+		return await asyncio.wrap_future(future)
+
+	@staticmethod
+	def _release(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore):
+		try:
+			loop.call_soon_threadsafe(semaphore.release)
+		except RuntimeError:
+			# Event loop already closed, nobody is left waiting
+			pass
+
+	async def compress_to(self, data: bytes | str, output_format: LZStringFormat):
+		return await self._run(functools.partial(_compress_one, data, LZStringFormat(output_format)), len(data))
+
+	async def decompress_from(self, encoded: bytes | str, input_format: LZStringFormat, as_text: bool = False):
+		return await self._run(functools.partial(_decompress_one, encoded, LZStringFormat(input_format), as_text), len(encoded))
+
+	async def compress_to_bytes(self, data: bytes | str):
+		return await self.compress_to(data, LZStringFormat.Bytes)
+
+	async def compress_to_base64(self, data: bytes | str):
+		return await self.compress_to(data, LZStringFormat.Base64)
+
+	async def compress_to_url_component(self, data: bytes | str, escape = True):
+		result = await self.compress_to(data, LZStringFormat.URIComponent)
+		if not escape:
+			result = result.replace("+", " ")
+		return result
+
+	async def compress_to_utf16(self, data: bytes | str):
+		return await self.compress_to(data, LZStringFormat.UTF16)
+
+	async def compress_to_uint8array(self, data: bytes | str):
+		return await self.compress_to(data, LZStringFormat.Uint8Array)
+
+	async def compress_to_raw_string(self, data: bytes | str):
+		return await self.compress_to(data, LZStringFormat.RawString)
+
+	async def decompress_from_bytes(self, data: bytes, as_text: bool = False):
+		return await self.decompress_from(data, LZStringFormat.Bytes, as_text = as_text)
+
+	async def decompress_from_base64(self, b64data: str, as_text: bool = False):
+		return await self.decompress_from(b64data, LZStringFormat.Base64, as_text = as_text)
+
+	async def decompress_from_url_component(self, urlcomponent: str, escape = True, as_text: bool = False):
+		if not escape:
+			urlcomponent = urlcomponent.replace(" ", "+")
+		return await self.decompress_from(urlcomponent, LZStringFormat.URIComponent, as_text = as_text)
+
+	async def decompress_from_utf16(self, text: str, as_text: bool = False):
+		return await self.decompress_from(text, LZStringFormat.UTF16, as_text = as_text)
+
+	async def decompress_from_uint8array(self, data: bytes, as_text: bool = False):
+		return await self.decompress_from(data, LZStringFormat.Uint8Array, as_text = as_text)
+
+	async def decompress_from_raw_string(self, text: str, as_text: bool = False):
+		return await self.decompress_from(text, LZStringFormat.RawString, as_text = as_text)
+
+	def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+		self._executor.shutdown(wait = wait, cancel_futures = cancel_futures)
+
+_default_codec = None
+
+def configure(**kwargs):
+	global _default_codec
+	if _default_codec is not None:
+		_default_codec.shutdown(wait = False)
+	_default_codec = AsyncCodec(**kwargs)
+	return _default_codec
+
+def default_codec():
+	if _default_codec is None:
+		configure()
+	return _default_codec
+
+def _delegate(name: str):
+	async def delegate(*args, **kwargs):
+		return await getattr(default_codec(), name)(*args, **kwargs)
+	delegate.__name__ = name
+	delegate.__qualname__ = name
+	return delegate
+
+compress_to = _delegate("compress_to")
+compress_to_bytes = _delegate("compress_to_bytes")
+compress_to_base64 = _delegate("compress_to_base64")
+compress_to_url_component = _delegate("compress_to_url_component")
+compress_to_utf16 = _delegate("compress_to_utf16")
+compress_to_uint8array = _delegate("compress_to_uint8array")
+compress_to_raw_string = _delegate("compress_to_raw_string")
+decompress_from = _delegate("decompress_from")
+decompress_from_bytes = _delegate("decompress_from_bytes")
+decompress_from_base64 = _delegate("decompress_from_base64")
+decompress_from_url_component = _delegate("decompress_from_url_component")
+decompress_from_utf16 = _delegate("decompress_from_utf16")
+decompress_from_uint8array = _delegate("decompress_from_uint8array")
+decompress_from_raw_string = _delegate("decompress_from_raw_string")
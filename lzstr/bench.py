@@ -0,0 +1,179 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+import lzstr
+from .LZString import LZStringCompressor, LZStringDecompressor, LZStringFormat
+
+def _text_corpus(rng: random.Random, size: int):
+	syllables = [ "ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "de", "en", "er", "an", "st", "ch" ]
+	vocabulary = [ "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))) for _ in range(2000) ]
+	weights = [ 1 / (rank + 1) for rank in range(len(vocabulary)) ]
+	words = [ ]
+	length = 0
+	while length < size:
+		sentence = " ".join(rng.choices(vocabulary, weights = weights, k = rng.randint(4, 16))).capitalize() + ". "
+		words.append(sentence)
+		length += len(sentence)
+	return "".join(words).encode("ascii")[:size]
+
+def _json_corpus(rng: random.Random, size: int):
+	records = [ ]
+	length = 0
+	while length < size:
+		record = json.dumps({ "id": len(records), "type": rng.choice([ "user", "group", "device" ]), "active": rng.random() < 0.8, "tags": rng.sample([ "a", "b", "c", "d", "e" ], 2), "score": rng.randint(0, 100) })
+		records.append(record)
+		length += len(record) + 2
+	return ("[" + ", ".join(records) + "]").encode("ascii")[:size]
+
+def _tiny_corpus(rng: random.Random, size: int):
+	payloads = [ ]
+	length = 0
+	while length < size:
+		payload = json.dumps({ "page": rng.randint(1, 50), "sort": rng.choice([ "name", "date" ]), "filter": rng.choice([ "", "open", "closed" ]), "q": "".join(rng.choice("abcdefgh ") for _ in range(rng.randint(0, 60))) }).encode("ascii")
+		payloads.append(payload)
+		length += len(payload)
+	return payloads
+
+def generate_corpora(size: int = 256 * 1024, seed: int = 0):
+	rng = random.Random(seed)
+	return {
+		"random": [ rng.randbytes(size) ],
+		"text": [ _text_corpus(rng, size) ],
+		"json": [ _json_corpus(rng, size) ],
+		"tiny": _tiny_corpus(rng, size),
+	}
+
+def _best_time(function, repeat: int):
+	best = None
+	for _ in range(repeat):
+		t0 = time.perf_counter()
+		function()
+		duration = time.perf_counter() - t0
+		if (best is None) or (duration < best):
+			best = duration
+	return best
+
+def _peak_memory(function):
+	tracemalloc.start()
+	try:
+		function()
+		return tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+def run_benchmarks(corpora: dict, formats: list | None = None, repeat: int = 3, measure_memory: bool = True):
+	formats = [ LZStringFormat.Bytes, LZStringFormat.Base64, LZStringFormat.URIComponent ] if (formats is None) else [ LZStringFormat(fmt) for fmt in formats ]
+	results = [ ]
+	for (corpus_name, payloads) in corpora.items():
+		uncompressed_bytes = sum(len(payload) for payload in payloads)
+		for output_format in formats:
+			compressed = [ LZStringCompressor.compress_to(payload, output_format) for payload in payloads ]
+			compressed_len = sum(len(data) for data in compressed)
+			operations = {
+				"compress": lambda: [ LZStringCompressor.compress_to(payload, output_format) for payload in payloads ],
+				"decompress": lambda: [ LZStringDecompressor.decompress_from(data, output_format) for data in compressed ],
+			}
+			for (operation, function) in operations.items():
+				seconds = _best_time(function, repeat)
+				results.append({
+					"corpus": corpus_name,
+					"format": output_format.value,
+					"operation": operation,
+					"payloads": len(payloads),
+					"bytes": uncompressed_bytes,
+					"ratio": compressed_len / max(uncompressed_bytes, 1),
+					"seconds": seconds,
+					"mb_per_s": uncompressed_bytes / seconds / 1e6,
+					"ops_per_s": len(payloads) / seconds,
+					"peak_memory": _peak_memory(function) if measure_memory else None,
+				})
+	return results
+
+def compare(results: list, baseline: list, tolerance: float = 0.1):
+	baseline = { (entry["corpus"], entry["format"], entry["operation"]): entry for entry in baseline }
+	regressions = [ ]
+	for entry in results:
+		reference = baseline.get((entry["corpus"], entry["format"], entry["operation"]))
+		if reference is None:
+			continue
+		name = f"{entry['corpus']}/{entry['format']}/{entry['operation']}"
+		if entry["mb_per_s"] < reference["mb_per_s"] * (1 - tolerance):
+			regressions.append(f"{name}: throughput {entry['mb_per_s']:.2f} MB/s, baseline {reference['mb_per_s']:.2f} MB/s")
+		if (entry["peak_memory"] is not None) and (reference["peak_memory"] is not None) and (entry["peak_memory"] > reference["peak_memory"] * (1 + tolerance)):
+			regressions.append(f"{name}: peak memory {entry['peak_memory']} bytes, baseline {reference['peak_memory']} bytes")
+	return regressions
+
+def _print_results(results: list):
+	print(f"{'corpus':<8s} {'format':<7s} {'operation':<10s} {'ratio':>6s} {'MB/s':>8s} {'ops/s':>10s} {'peak kB':>9s}")
+	for entry in results:
+		peak = "-" if (entry["peak_memory"] is None) else f"{entry['peak_memory'] / 1024:.0f}"
+		print(f"{entry['corpus']:<8s} {entry['format']:<7s} {entry['operation']:<10s} {entry['ratio']:6.3f} {entry['mb_per_s']:8.2f} {entry['ops_per_s']:10.1f} {peak:>9s}")
+
+def main(argv: list | None = None):
+	parser = argparse.ArgumentParser(prog = "python3 -m lzstr.bench", description = "Benchmark lzstr compression and decompression on deterministic corpora.")
+	parser.add_argument("-s", "--size", metavar = "bytes", type = int, default = 256 * 1024, help = "Size of each generated corpus. Defaults to %(default)d.")
+	parser.add_argument("--seed", metavar = "int", type = int, default = 0, help = "Seed of the corpus generator. Defaults to %(default)d.")
+	parser.add_argument("-r", "--repeat", metavar = "count", type = int, default = 3, help = "Take the best of this many runs. Defaults to %(default)d.")
+	parser.add_argument("-c", "--corpus", choices = [ "random", "text", "json", "tiny" ], action = "append", help = "Only run this corpus. Can be given multiple times.")
+	parser.add_argument("-f", "--format", choices = [ fmt.value for fmt in LZStringFormat ], action = "append", help = "Only run this format. Can be given multiple times. Defaults to bytes, base64 and uri.")
+	parser.add_argument("--no-memory", action = "store_true", help = "Do not measure peak memory usage.")
+	parser.add_argument("-o", "--output", metavar = "filename", help = "Write the results as JSON to this file.")
+	parser.add_argument("--compare", metavar = "filename", help = "Compare against a JSON baseline and exit with status 1 on regressions.")
+	parser.add_argument("-t", "--tolerance", metavar = "fraction", type = float, default = 0.1, help = "Relative deviation from the baseline that is tolerated. Defaults to %(default).2f.")
+	args = parser.parse_args(argv)
+
+	corpora = generate_corpora(size = args.size, seed = args.seed)
+	if args.corpus is not None:
+		corpora = { name: payloads for (name, payloads) in corpora.items() if name in args.corpus }
+	results = run_benchmarks(corpora, formats = args.format, repeat = args.repeat, measure_memory = not args.no_memory)
+	_print_results(results)
+
+	if args.output is not None:
+		with open(args.output, "w") as f:
+			json.dump({
+				"lzstr_version": lzstr.VERSION,
+				"python": platform.python_version(),
+				"implementation": platform.python_implementation(),
+				"size": args.size,
+				"seed": args.seed,
+				"results": results,
+			}, f, indent = 4)
+			f.write("\n")
+
+	if args.compare is not None:
+		with open(args.compare) as f:
+			baseline = json.load(f)["results"]
+		regressions = compare(results, baseline, tolerance = args.tolerance)
+		for regression in regressions:
+			print(f"REGRESSION {regression}")
+		if len(regressions) > 0:
+			return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
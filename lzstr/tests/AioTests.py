@@ -0,0 +1,96 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import os
+import asyncio
+import threading
+import unittest
+import lzstr.aio
+from lzstr import LZStringCompressor, LZStringDecompressionException
+
+class AioTests(unittest.TestCase):
+	def test_roundtrip_inline_and_offloaded(self):
+		async def roundtrip(data):
+			compressed = await codec.compress_to_url_component(data)
+			self.assertEqual(compressed, LZStringCompressor.compress_to_url_component(data))
+			return await codec.decompress_from_url_component(compressed)
+
+		async def run():
+			payloads = [ os.urandom(10), b"foobar" * 2000, os.urandom(3000) ]
+			results = await asyncio.gather(*[ roundtrip(payload) for payload in payloads ])
+			self.assertEqual(results, payloads)
+			self.assertIsInstance(results[1], bytes)
+
+		codec = lzstr.aio.AsyncCodec(inline_threshold = 100, max_workers = 2, max_concurrency = 1)
+		try:
+			asyncio.run(run())
+		finally:
+			codec.shutdown()
+
+	def test_default_codec(self):
+		async def run():
+			compressed = await lzstr.aio.compress_to_base64("Grüße")
+			self.assertEqual(await lzstr.aio.decompress_from_base64(compressed, as_text = True), "Grüße")
+			with self.assertRaises(LZStringDecompressionException):
+				await lzstr.aio.decompress_from_bytes(bytes([ 0xff ]))
+		asyncio.run(run())
+
+	def test_cancellation(self):
+		async def run():
+			task = asyncio.ensure_future(codec.compress_to_bytes(os.urandom(200000)))
+			await asyncio.sleep(0)
+			task.cancel()
+			with self.assertRaises(asyncio.CancelledError):
+				await task
+
+		codec = lzstr.aio.AsyncCodec(inline_threshold = 0, max_workers = 1)
+		try:
+			asyncio.run(run())
+		finally:
+			codec.shutdown(cancel_futures = True)
+
+	def test_cancellation_keeps_slot(self):
+		started = threading.Event()
+		finish = threading.Event()
+		async def run():
+			def blocking():
+				started.set()
+				finish.wait()
+				return b"done"
+			task = asyncio.ensure_future(codec._run(blocking, 1))
+			await asyncio.get_running_loop().run_in_executor(None, started.wait)
+			task.cancel()
+			with self.assertRaises(asyncio.CancelledError):
+				await task
+
+			# The work item still runs, so its slot must not be handed out
+			follower = asyncio.ensure_future(codec._run(lambda: b"next", 1))
+			await asyncio.sleep(0.05)
+			self.assertFalse(follower.done())
+			finish.set()
+			self.assertEqual(await follower, b"next")
+
+		codec = lzstr.aio.AsyncCodec(inline_threshold = 0, max_workers = 2, max_concurrency = 1)
+		try:
+			asyncio.run(run())
+		finally:
+			finish.set()
+			codec.shutdown()
@@ -0,0 +1,49 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import os
+import unittest
+from lzstr import LZStringCompressor, LZStringFormat, LZStringDecompressionException, compress_many, decompress_many
+
+class BatchTests(unittest.TestCase):
+	def setUp(self):
+		self._items = [ os.urandom(i) for i in range(50) ] + [ b"foobar" * i for i in range(50) ]
+
+	def test_compress_many(self):
+		for processes in [ 1, 2 ]:
+			compressed = compress_many(self._items, LZStringFormat.URIComponent, processes = processes, chunksize = 7)
+			self.assertEqual(compressed, [ LZStringCompressor.compress_to_url_component(item) for item in self._items ])
+
+	def test_roundtrip_stream(self):
+		compressed = compress_many(self._items, "base64", processes = 2, stream = True)
+		self.assertFalse(isinstance(compressed, list))
+		self.assertEqual(list(decompress_many(compressed, "base64", processes = 2, stream = True)), self._items)
+
+	def test_decompress_capture_errors(self):
+		compressed = compress_many([ b"foo", b"bar" ], processes = 1)
+		items = [ compressed[0], bytes([ 0xff, 0xff ]), compressed[1] ]
+		with self.assertRaises(LZStringDecompressionException):
+			decompress_many(items, processes = 1)
+
+		results = decompress_many(items, processes = 2, capture_errors = True)
+		self.assertEqual(results[0], b"foo")
+		self.assertIsInstance(results[1], LZStringDecompressionException)
+		self.assertEqual(results[2], b"bar")
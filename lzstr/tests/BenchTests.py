@@ -0,0 +1,40 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import unittest
+from lzstr.bench import generate_corpora, run_benchmarks, compare
+
+class BenchTests(unittest.TestCase):
+	def test_corpora_deterministic(self):
+		corpora = generate_corpora(size = 2000, seed = 1)
+		self.assertEqual(corpora, generate_corpora(size = 2000, seed = 1))
+		self.assertEqual(set(corpora), { "random", "text", "json", "tiny" })
+		self.assertGreater(len(corpora["tiny"]), 1)
+
+	def test_run_and_compare(self):
+		results = run_benchmarks(generate_corpora(size = 500), formats = [ "bytes", "uri" ], repeat = 1)
+		self.assertEqual(len(results), 4 * 2 * 2)
+		self.assertEqual(compare(results, results), [ ])
+
+		slower = [ dict(entry, mb_per_s = entry["mb_per_s"] / 2) for entry in results ]
+		self.assertEqual(len(compare(slower, results)), len(results))
+		bigger = [ dict(entry, peak_memory = entry["peak_memory"] * 2) for entry in results ]
+		self.assertEqual(len(compare(bigger, results)), len(results))
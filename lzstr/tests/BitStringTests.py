@@ -19,8 +19,15 @@
 #
 #	Johannes Bauer <JohannesBauer@gmx.de>
 
+import sys
+import mmap
+import array
+import random
+import tempfile
 import unittest
-from lzstr import BitString
+import subprocess
+from lzstr import BitString, StreamFormat
+from lzstr.StreamFormat import UTF16Format, code_units
 
 class BitStringTests(unittest.TestCase):
 	def test_bitstring_seek_retrieve(self):
@@ -63,3 +70,101 @@ class BitStringTests(unittest.TestCase):
 		self.assertEqual(bs.read_bits(4), 0)
 		self.assertEqual(bs.read_bits(8), ord("D"))
 		self.assertEqual(bs.read_bits(4), 2)
+
+	def test_append_value_matches_bitwise(self):
+		values = [ (0, 1), (1, 1), (5, 3), (0x3ff, 10), (12345, 17), (0, 8), (0xabcdef, 24), (3, 2), (0x1ffff, 17) ]
+		bs = BitString()
+		reference = BitString()
+		for (value, bitcount) in values:
+			bs.append_value(value, bitcount)
+			for i in range(bitcount):
+				reference.set_bit(reference.bit_len, (value >> i) & 1)
+		self.assertEqual(bs, reference)
+		self.assertEqual(bs.bit_len, sum(bitcount for (value, bitcount) in values))
+
+		bs.seek(0)
+		for (value, bitcount) in values:
+			self.assertEqual(bs.read_bits(bitcount), value)
+		self.assertEqual(bs.read_bits(13), 0)
+
+	def test_read_chars(self):
+		bs = BitString()
+		bs.append_value(1, 3)
+		for char in b"foobar":
+			bs.append_value(char, 8)
+		bs.seek(3)
+		self.assertEqual(bs.read_chars(6), bytearray(b"foobar"))
+
+	def test_6bit_alphabet_roundtrip(self):
+		for bitlen in range(0, 80):
+			bs = BitString()
+			for i in range(bitlen):
+				bs.append((i * 7 + bitlen) % 3 == 0)
+			char_count = (bitlen + 5) // 6
+			for (encode, decode) in [ (bs.to_base64, BitString.from_base64), (bs.to_url_component, BitString.from_url_component) ]:
+				text = encode()
+				self.assertEqual(len(text), char_count)
+				decoded = decode(text)
+				self.assertEqual(decoded.bit_len, 6 * char_count)
+				decoded.seek(0)
+				bs.seek(0)
+				self.assertEqual(decoded.read_bits(6 * char_count), bs.read_bits(6 * char_count))
+
+	def test_6bit_alphabet_stops_at_invalid_char(self):
+		self.assertEqual(BitString.from_url_component("IY1-kA=IY1").bit_len, 36)
+		self.assertEqual(BitString.from_base64("IY1/kA==").bit_len, 36)
+		self.assertEqual(BitString.from_base64("IY1-kA==").bit_len, 18)
+
+	def test_from_buffer_zero_copy(self):
+		data = bytearray(bytes.fromhex("208210c202240000"))
+		for buffer in [ data, memoryview(data), memoryview(data)[:], array.array("H", bytes(data)) ]:
+			bs = BitString.from_buffer(buffer)
+			self.assertEqual(bs.bit_len, 64)
+			self.assertEqual(bytes(bs), bytes(data))
+			bs.seek(2)
+			self.assertEqual(bs.read_bits(8), ord("A"))
+
+		view = BitString.from_buffer(memoryview(data))
+		data[0] = 0xff
+		view.seek(0)
+		self.assertEqual(view.read_bits(8), 0xff)
+
+	def test_from_file(self):
+		with tempfile.NamedTemporaryFile() as f:
+			bs = BitString.from_file(f.name)
+			self.assertEqual(bs.bit_len, 0)
+			f.write(bytes.fromhex("208210c202240000"))
+			f.flush()
+			bs = BitString.from_file(f.name)
+			self.assertIsInstance(bs._bs, mmap.mmap)
+			self.assertEqual(bs.bit_len, 64)
+			bs.seek(13)
+			self.assertEqual(bs.read_bits(8), ord("B"))
+
+	def test_bit_text_roundtrip(self):
+		rng = random.Random(1)
+		for length in range(70):
+			bits = "".join(rng.choice("01") for _ in range(length))
+			bs = BitString.from_bit_text(" ".join(bits[i : i + 3] for i in range(0, length, 3)))
+			self.assertEqual(bs.bit_len, length)
+			self.assertEqual(bs.to_text(), bits)
+			for (index, bit) in enumerate(bits):
+				self.assertEqual(bs.get_bit(index), int(bit))
+			bs.append(1)
+			self.assertEqual(bs.to_text(), bits + "1")
+
+	def test_utf16_backends(self):
+		rng = random.Random(2)
+		for length in list(range(32)) + [ 1000 ]:
+			data = rng.randbytes(length)
+			encoded = UTF16Format._encode_python(data, (8 * length) // 15 + 1)
+			units = code_units(encoded)
+			self.assertEqual(UTF16Format._decode_python(units)[:length], data)
+			if StreamFormat._load_numpy():
+				self.assertEqual(UTF16Format._encode_numpy(data, (8 * length) // 15 + 1), encoded)
+				self.assertEqual(UTF16Format._decode_numpy(units), UTF16Format._decode_python(units))
+
+	def test_numpy_imported_lazily(self):
+		script = "import sys, lzstr; lzstr.LZStringCompressor.compress_to_utf16('foobar' * 100); print('numpy' in sys.modules)"
+		result = subprocess.run([ sys.executable, "-c", script ], check = True, capture_output = True, text = True)
+		self.assertEqual(result.stdout.strip(), "False")
@@ -0,0 +1,91 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import os
+import io
+import tempfile
+import unittest
+import unittest.mock
+import contextlib
+from lzstr.__main__ import main
+from lzstr import LZStringDecompressor
+
+class CLITests(unittest.TestCase):
+	def test_files_roundtrip(self):
+		contents = { "a.txt": b"foobar" * 1000, "b.bin": os.urandom(1000), "empty": b"" }
+		with tempfile.TemporaryDirectory() as tmpdir:
+			for (name, data) in contents.items():
+				with open(os.path.join(tmpdir, name), "wb") as f:
+					f.write(data)
+			filenames = [ os.path.join(tmpdir, name) for name in contents ]
+
+			stderr = io.StringIO()
+			with contextlib.redirect_stderr(stderr):
+				self.assertEqual(main([ "-j", "2" ] + filenames), 0)
+			self.assertEqual(len(stderr.getvalue().splitlines()), 3)
+			for jobs in [ "0", "-1" ]:
+				stderr = io.StringIO()
+				with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as context:
+					main([ "-j", jobs ] + filenames)
+				self.assertEqual(context.exception.code, 2)
+				self.assertIn("lzstr: error: argument -j/--jobs: must be at least 1", stderr.getvalue())
+			with open(os.path.join(tmpdir, "a.txt.lzs"), "rb") as f:
+				self.assertEqual(LZStringDecompressor.decompress_from_bytes(f.read()), contents["a.txt"])
+
+			with contextlib.redirect_stderr(io.StringIO()):
+				self.assertEqual(main([ "-q" ] + filenames), 1)
+				for filename in filenames:
+					os.unlink(filename)
+				self.assertEqual(main([ "-q", "-d" ] + [ filename + ".lzs" for filename in filenames ]), 0)
+				self.assertEqual(main([ "-q", "-d", filenames[0] ]), 1)
+			for (name, data) in contents.items():
+				with open(os.path.join(tmpdir, name), "rb") as f:
+					self.assertEqual(f.read(), data)
+
+	def test_text_format(self):
+		with tempfile.TemporaryDirectory() as tmpdir:
+			filename = os.path.join(tmpdir, "data")
+			with open(filename, "wb") as f:
+				f.write(b"foobar" * 1000)
+			stderr = io.StringIO()
+			with contextlib.redirect_stderr(stderr):
+				self.assertEqual(main([ "-F", "uri", "-S", ".uri", filename ]), 0)
+			with open(filename + ".uri") as f:
+				text = f.read()
+			self.assertIn(f"6000 / {os.stat(filename + '.uri').st_size} bytes", stderr.getvalue())
+			self.assertTrue(text.endswith("\n"))
+			self.assertEqual(LZStringDecompressor.decompress_from_url_component(text.rstrip("\n")), b"foobar" * 1000)
+
+			os.unlink(filename)
+			self.assertEqual(main([ "-q", "-d", "-F", "uri", "-S", ".uri", filename + ".uri" ]), 0)
+			with open(filename, "rb") as f:
+				self.assertEqual(f.read(), b"foobar" * 1000)
+
+	def test_stdio(self):
+		stdout = io.TextIOWrapper(io.BytesIO())
+		with unittest.mock.patch("sys.stdin", io.TextIOWrapper(io.BytesIO(b"foobar" * 100))), unittest.mock.patch("sys.stdout", stdout):
+			self.assertEqual(main([ ]), 0)
+		self.assertEqual(LZStringDecompressor.decompress_from_bytes(stdout.buffer.getvalue()), b"foobar" * 100)
+
+		stderr = io.StringIO()
+		with unittest.mock.patch("sys.stdin", io.TextIOWrapper(io.BytesIO(b"\xff\xff\xff"))), unittest.mock.patch("sys.stdout", io.TextIOWrapper(io.BytesIO())), contextlib.redirect_stderr(stderr):
+			self.assertEqual(main([ "-d" ]), 1)
+		self.assertIn("lzstr: <stdin>: LZStringDecompressionException", stderr.getvalue())
@@ -0,0 +1,68 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import os
+import unittest
+import concurrent.futures
+from lzstr import CodecPool, LZStringCompressor, LZStringFormat, DecompressionLimits, LZStringOutputLimitException
+
+class CodecPoolTests(unittest.TestCase):
+	def test_reuse(self):
+		pool = CodecPool()
+		compressor = pool.compressor
+		for data in [ b"foobar" * 100, b"", "Grüße" * 10, os.urandom(500), b"a" ]:
+			for fmt in LZStringFormat:
+				encoded = pool.compress_to(data, fmt)
+				self.assertEqual(encoded, LZStringCompressor.compress_to(data, fmt))
+				self.assertEqual(pool.decompress_from(encoded, fmt, as_text = isinstance(data, str)), data)
+		self.assertIs(pool.compressor, compressor)
+		self.assertEqual(pool.decompress_from(LZStringCompressor.compress_to_base64(b"foobar" * 100), LZStringFormat.Base64, prefix = 4), b"foob")
+
+		pool.reset()
+		self.assertIsNot(pool.compressor, compressor)
+
+	def test_errors(self):
+		pool = CodecPool()
+		encoded = pool.compress_to(b"x" * 1000, LZStringFormat.Bytes)
+		with self.assertRaises(LZStringOutputLimitException):
+			pool.decompress_from(encoded, LZStringFormat.Bytes, limits = DecompressionLimits(max_output = 10))
+		self.assertEqual(pool.decompress_from(encoded, LZStringFormat.Bytes), b"x" * 1000)
+
+	def test_compressor_reset(self):
+		compressor = LZStringCompressor(b"foobar")
+		first = compressor.compress()
+		compressor.reset(b"foobar")
+		self.assertEqual(bytes(compressor.compress()), bytes(first))
+		compressor.reset(output_format = LZStringFormat.Base64)
+		self.assertEqual(compressor.feed(b"foobar") + compressor.flush(), LZStringCompressor.compress_to_base64(b"foobar"))
+
+	def test_threads(self):
+		pool = CodecPool()
+		payloads = [ os.urandom(100) + (b"%d" % i) * 50 for i in range(64) ]
+		def roundtrip(data):
+			encoded = pool.compress_to(data, LZStringFormat.URIComponent)
+			return (encoded, pool.decompress_from(encoded, LZStringFormat.URIComponent), pool.compressor)
+		with concurrent.futures.ThreadPoolExecutor(max_workers = 4) as executor:
+			results = list(executor.map(roundtrip, payloads))
+		for (data, (encoded, decoded, compressor)) in zip(payloads, results):
+			self.assertEqual(encoded, LZStringCompressor.compress_to_url_component(data))
+			self.assertEqual(decoded, data)
+		self.assertLessEqual(len(set(id(compressor) for (_, _, compressor) in results)), 4)
@@ -0,0 +1,147 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import io
+import math
+import time
+import random
+import unittest
+import tracemalloc
+from lzstr import LZStringCompressor, LZStringDecompressor, LZStringFormat
+
+class ComplexityTests(unittest.TestCase):
+	# Runs every operation on inputs of doubling size and fits the exponent k
+	# of time ~ n^k and memory ~ n^k. Memory is traced on smaller inputs since
+	# tracemalloc is slow, but it is deterministic; linear behavior gives k
+	# close to 1 (less for small inputs where constant overhead dominates),
+	# quadratic gives 2. The CPU time of every run is divided by that of a
+	# plain loop over an input of the same size, measured right after it, so
+	# that changes in machine speed cancel out. Linear behavior then gives k
+	# close to 0, quadratic gives 1.
+	_TIME_SIZES = [ 2 ** 13, 2 ** 14, 2 ** 15, 2 ** 16 ]
+	_MEMORY_SIZES = [ 2 ** 10, 2 ** 11, 2 ** 12, 2 ** 13 ]
+	_MAX_TIME_EXPONENT = 0.4
+	_MAX_MEMORY_EXPONENT = 1.2
+	_REPEAT = 3
+
+	_CORPORA = {
+		"run": lambda size: b"A" * size,
+		"all_bytes": lambda size: bytes(range(256)) * (size // 256),
+		"random": lambda size: random.Random(size).randbytes(size),
+		"phrases": lambda size: (b"the quick brown fox jumps over the lazy dog " * size)[:size],
+		"text_run": lambda size: "€" * size,
+	}
+
+	@staticmethod
+	def _exponent(sizes: list, values: list):
+		# Least-squares slope in log-log space
+		xs = [ math.log(size) for size in sizes ]
+		ys = [ math.log(max(value, 1e-9)) for value in values ]
+		x_mean = sum(xs) / len(xs)
+		y_mean = sum(ys) / len(ys)
+		return sum((x - x_mean) * (y - y_mean) for (x, y) in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+
+	@staticmethod
+	def _reference(size: int):
+		total = 0
+		for value in range(size):
+			total += value & 0xff
+		return total
+
+	def _relative_time(self, function, inputs: list, sizes: list):
+		ratios = [ ]
+		for (argument, size) in zip(inputs, sizes):
+			best = None
+			for _ in range(self._REPEAT):
+				t0 = time.process_time()
+				function(argument)
+				t1 = time.process_time()
+				self._reference(size)
+				t2 = time.process_time()
+				ratio = (t1 - t0) / max(t2 - t1, 1e-6)
+				best = ratio if (best is None) else min(best, ratio)
+			ratios.append(best)
+		return ratios
+
+	def _peak_memory(self, function, inputs: list):
+		peaks = [ ]
+		for argument in inputs:
+			tracemalloc.start()
+			try:
+				function(argument)
+				peaks.append(tracemalloc.get_traced_memory()[1])
+			finally:
+				tracemalloc.stop()
+		return peaks
+
+	def _inputs(self, generator, sizes: list, prepare):
+		inputs = [ generator(size) for size in sizes ]
+		if prepare is not None:
+			inputs = [ prepare(data) for data in inputs ]
+		return inputs
+
+	def _time_exponent(self, function, generator, prepare = None):
+		return self._exponent(self._TIME_SIZES, self._relative_time(function, self._inputs(generator, self._TIME_SIZES, prepare), self._TIME_SIZES))
+
+	def _memory_exponent(self, function, generator, prepare = None):
+		return self._exponent(self._MEMORY_SIZES, self._peak_memory(function, self._inputs(generator, self._MEMORY_SIZES, prepare)))
+
+	def _assert_linear(self, name: str, function, prepare = None):
+		for (corpus, generator) in self._CORPORA.items():
+			with self.subTest(operation = name, corpus = corpus):
+				time_exponent = self._time_exponent(function, generator, prepare)
+				if time_exponent >= self._MAX_TIME_EXPONENT:
+					# Other processes can only slow down single runs, a real
+					# super-linear term shows up in every measurement
+					time_exponent = min(time_exponent, self._time_exponent(function, generator, prepare))
+				self.assertLess(time_exponent, self._MAX_TIME_EXPONENT, f"{name} on {corpus}: time relative to a linear loop grows with n^{time_exponent:.2f}")
+				memory_exponent = self._memory_exponent(function, generator, prepare)
+				self.assertLess(memory_exponent, self._MAX_MEMORY_EXPONENT, f"{name} on {corpus}: memory grows with n^{memory_exponent:.2f}")
+
+	def test_detects_superlinear(self):
+		# Appending to immutable bytes copies everything so far every time
+		def concatenate(data: bytes):
+			result = b""
+			for offset in range(0, len(data), 16):
+				result = result + data[offset : offset + 16]
+			return result
+		def prefixes(data: bytes):
+			return [ data[ : offset] for offset in range(0, len(data), 16) ]
+		self.assertGreater(self._time_exponent(concatenate, self._CORPORA["random"]), self._MAX_TIME_EXPONENT)
+		self.assertGreater(self._memory_exponent(prefixes, self._CORPORA["random"]), self._MAX_MEMORY_EXPONENT)
+
+	def test_compress(self):
+		self._assert_linear("compress", lambda data: LZStringCompressor.compress_to(data, LZStringFormat.Base64))
+
+	def test_compressed_size(self):
+		self._assert_linear("compressed_size", LZStringCompressor.compressed_bit_len)
+
+	def test_decompress(self):
+		self._assert_linear("decompress", lambda encoded: LZStringDecompressor.decompress_from(encoded, LZStringFormat.Base64), prepare = LZStringCompressor.compress_to_base64)
+
+	def test_decompress_text(self):
+		self._assert_linear("decompress_text", lambda encoded: LZStringDecompressor.decompress_from(encoded, LZStringFormat.UTF16, as_text = True), prepare = LZStringCompressor.compress_to_utf16)
+
+	def test_decompress_chunks(self):
+		self._assert_linear("decompress_chunks", lambda encoded: sum(len(chunk) for chunk in LZStringDecompressor.decompress_chunks(io.BytesIO(encoded), chunk_size = 4096)), prepare = LZStringCompressor.compress_to_bytes)
+
+	def test_scan(self):
+		self._assert_linear("scan", lambda encoded: LZStringDecompressor.scan_from(encoded, LZStringFormat.Bytes), prepare = LZStringCompressor.compress_to_bytes)
@@ -0,0 +1,72 @@
+#	pylzstr - Native Python implementation of LZString string compression
+#	Copyright (C) 2022-2022 Johannes Bauer
+#
+#	This file is part of pylzstr.
+#
+#	pylzstr is free software; you can redistribute it and/or modify
+#	it under the terms of the GNU General Public License as published by
+#	the Free Software Foundation; this program is ONLY licensed under
+#	version 3 of the License, later versions are explicitly excluded.
+#
+#	pylzstr is distributed in the hope that it will be useful,
+#	but WITHOUT ANY WARRANTY; without even the implied warranty of
+#	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#	GNU General Public License for more details.
+#
+#	You should have received a copy of the GNU General Public License
+#	along with pylzstr; if not, write to the Free Software
+#	Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+#	Johannes Bauer <JohannesBauer@gmx.de>
+
+import unittest
+from lzstr import LRUCache, LZStringCompressor, LZStringDecompressor
+
+class LRUCacheTests(unittest.TestCase):
+	def test_entry_limit(self):
+		cache = LRUCache(max_entries = 2)
+		cache.put("a", b"1", 1)
+		cache.put("b", b"2", 1)
+		self.assertEqual(cache.get("a"), b"1")
+		cache.put("c", b"3", 1)
+		self.assertIsNone(cache.get("b"))
+		self.assertEqual(cache.get("a"), b"1")
+		self.assertEqual(cache.get("c"), b"3")
+		self.assertEqual(cache.statistics(), { "entries": 2, "total_bytes": 2, "hits": 3, "misses": 1, "evictions": 1, "expirations": 0 })
+
+	def test_byte_limit(self):
+		cache = LRUCache(max_bytes = 10)
+		cache.put("a", b"1", 6)
+		cache.put("b", b"2", 6)
+		self.assertEqual(len(cache), 1)
+		self.assertEqual(cache.total_bytes, 6)
+		cache.put("c", b"3", 11)
+		self.assertEqual(cache.get("b"), b"2")
+		self.assertIsNone(cache.get("c"))
+
+	def test_ttl(self):
+		now = [ 0 ]
+		cache = LRUCache(ttl = 5, clock = lambda: now[0])
+		cache.put("a", b"1", 1)
+		now[0] = 4.9
+		self.assertEqual(cache.get("a"), b"1")
+		now[0] = 5
+		self.assertIsNone(cache.get("a"))
+		self.assertEqual(cache.expirations, 1)
+		self.assertEqual(len(cache), 0)
+
+	def test_codec_cache(self):
+		LZStringCompressor.cache = LRUCache()
+		LZStringDecompressor.cache = LRUCache()
+		try:
+			for _ in range(3):
+				compressed = LZStringCompressor.compress_to_url_component(b"foobar" * 10)
+				result = LZStringDecompressor.decompress_from_url_component(compressed)
+				self.assertIsInstance(result, bytes)
+				self.assertEqual(result, b"foobar" * 10)
+			self.assertEqual(LZStringDecompressor.decompress_from_url_component(compressed, as_text = True), "foobar" * 10)
+			self.assertEqual((LZStringCompressor.cache.hits, LZStringCompressor.cache.misses), (2, 1))
+			self.assertEqual((LZStringDecompressor.cache.hits, LZStringDecompressor.cache.misses), (2, 2))
+		finally:
+			LZStringCompressor.cache = None
+			LZStringDecompressor.cache = None
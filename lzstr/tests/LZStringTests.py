@@ -19,11 +19,17 @@
 #
 #	Johannes Bauer <JohannesBauer@gmx.de>
 
+import io
 import os
+import array
+import pickle
+import random
+import tempfile
 import unittest
 import pkgutil
 import json
-from lzstr import BitString, LZStringDecompressor, LZStringCompressor
+from lzstr.StreamFormat import code_units
+from lzstr import BitString, LZStringDecompressor, LZStringCompressor, LZStringFormat, LZStringDecompressionException, LZStringTruncatedInputException, LZStringOutputLimitException, LZStringDictionaryLimitException, LZStringInputLimitException, DecompressionLimits
 
 class LZStringTests(unittest.TestCase):
 	def setUp(self):
@@ -105,3 +111,369 @@ class LZStringTests(unittest.TestCase):
 		self.assertTrue(isinstance(compressed, str))
 		decompressed = LZStringDecompressor.decompress_from_url_component(compressed)
 		self.assertEqual(random_data, decompressed)
+
+	def test_streaming_compression(self):
+		data = b"".join(test_vector["uncompressed"] for test_vector in self._test_vectors) + os.urandom(500)
+		for chunk_size in [ 1, 2, 3, 7, 64, len(data) ]:
+			chunks = [ data[i : i + chunk_size] for i in range(0, len(data), chunk_size) ]
+			self.assertEqual(b"".join(LZStringCompressor.compress_chunks(chunks)), LZStringCompressor.compress_to_bytes(data))
+			self.assertEqual("".join(LZStringCompressor.compress_chunks(chunks, LZStringFormat.Base64)), LZStringCompressor.compress_to_base64(data))
+			self.assertEqual("".join(LZStringCompressor.compress_chunks(chunks, "uri")), LZStringCompressor.compress_to_url_component(data))
+
+	def test_streaming_compression_flushed(self):
+		compressor = LZStringCompressor()
+		self.assertEqual(compressor.feed(b"a"), b"")
+		self.assertEqual(compressor.flush(), bytes([ 33, 144 ]))
+		with self.assertRaises(ValueError):
+			compressor.feed(b"a")
+
+		compressor = LZStringCompressor(b"foobar" * 10)
+		output = compressor.feed(b"xyz" * 100)
+		with self.assertRaises(ValueError):
+			compressor.compress()
+		self.assertEqual(output + compressor.flush(), LZStringCompressor.compress_to_bytes(b"xyz" * 100))
+
+	def test_streaming_decompression(self):
+		data = b"".join(test_vector["uncompressed"] for test_vector in self._test_vectors) + os.urandom(500)
+		compressed = {
+			LZStringFormat.Bytes: LZStringCompressor.compress_to_bytes(data),
+			LZStringFormat.Base64: LZStringCompressor.compress_to_base64(data) + "==",
+			LZStringFormat.URIComponent: LZStringCompressor.compress_to_url_component(data),
+		}
+		for (input_format, compressed_data) in compressed.items():
+			for chunk_size in [ 1, 2, 3, 5, 64, len(data) ]:
+				chunks = [ compressed_data[i : i + chunk_size] for i in range(0, len(compressed_data), chunk_size) ]
+				self.assertEqual(b"".join(LZStringDecompressor.decompress_chunks(chunks, input_format)), data)
+			stream = io.BytesIO(compressed_data) if isinstance(compressed_data, bytes) else io.StringIO(compressed_data)
+			output = list(LZStringDecompressor.decompress_chunks(stream, input_format, chunk_size = 100))
+			self.assertGreater(len(output), 1)
+			self.assertEqual(b"".join(output), data)
+
+	def test_streaming_decompression_truncated(self):
+		compressed = LZStringCompressor.compress_to_bytes(b"foobar" * 10)
+		with self.assertRaises(LZStringDecompressionException):
+			b"".join(LZStringDecompressor.decompress_chunks([ compressed[:-2] ]))
+
+		# Padding bits of a partial symbol group are not input
+		rng = random.Random(7)
+		data = rng.randbytes(rng.randint(1, 300)) + b"foo" * rng.randint(0, 50)
+		with self.assertRaises(LZStringTruncatedInputException):
+			b"".join(LZStringDecompressor.decompress_chunks([ LZStringCompressor.compress_to_url_component(data)[:134] ], LZStringFormat.URIComponent))
+		for input_format in [ LZStringFormat.Base64, LZStringFormat.URIComponent, LZStringFormat.UTF16 ]:
+			encoded = LZStringCompressor.compress_to(data, input_format)
+			for cut in range(len(encoded)):
+				try:
+					expected = LZStringDecompressor.from_format(encoded[:cut], input_format).decompress()
+				except LZStringTruncatedInputException:
+					expected = None
+				for chunk_size in [ 3 ]:
+					chunks = [ encoded[i : min(i + chunk_size, cut)] for i in range(0, cut, chunk_size) ]
+					if expected is None:
+						with self.assertRaises(LZStringTruncatedInputException):
+							b"".join(LZStringDecompressor.decompress_chunks(chunks, input_format))
+					else:
+						self.assertEqual(b"".join(LZStringDecompressor.decompress_chunks(chunks, input_format)), expected)
+
+	def test_repetitive_roundtrip(self):
+		for data in [ b"a" * 5000, b"abcabcabd" * 700, bytes(range(256)) * 30, b"".join(bytes([ i % 7 ]) * (i % 13) for i in range(3000)) ]:
+			compressed = LZStringCompressor(data).compress()
+			self.assertEqual(LZStringDecompressor(compressed).decompress(), data)
+			self.assertEqual(b"".join(LZStringDecompressor.decompress_chunks([ bytes(compressed) ])), data)
+
+	def test_word_symbols_javascript_formats(self):
+		# Reference output of the JavaScript implementation
+		text = "Grüße, 日本語 😀 日本語!"
+		utf16 = "".join(chr(unit) for unit in [ 7265, 7215, 25110, 2688, 6688, 4660, 31368, 3417, 20633, 10458, 3041, 23584, 3985, 21552, 17440, 32 ])
+		uint8array = bytes([ 56, 130, 112, 63, 15, 176, 166, 3, 64, 4, 133, 61, 52, 13, 57, 160, 242, 162, 232, 94, 13, 192, 1, 238, 53, 4, 34, 0 ])
+		self.assertEqual(LZStringCompressor.compress_to_utf16(text), utf16)
+		self.assertEqual(LZStringCompressor.compress_to_uint8array(text), uint8array)
+		self.assertEqual(LZStringCompressor.compress_to_raw_string(text), uint8array.decode("utf-16-be", "surrogatepass"))
+		self.assertEqual(LZStringCompressor.compress_to_base64(text), "OIJwPw+wpgNABIU9NA05oPKi6F4NwAHuNQQiA")
+
+		self.assertEqual(LZStringDecompressor.decompress_from_utf16(utf16, as_text = True), text)
+		self.assertEqual(LZStringDecompressor.decompress_from_uint8array(uint8array, as_text = True), text)
+		self.assertEqual(LZStringDecompressor.decompress_from_raw_string(uint8array.decode("utf-16-be", "surrogatepass"), as_text = True), text)
+		self.assertEqual(LZStringDecompressor.decompress_from_base64("OIJwPw+wpgNABIU9NA05oPKi6F4NwAHuNQQiA==", as_text = True), text)
+
+	def test_word_symbols_streaming(self):
+		text = "abcሴÿĀ" * 200 + "\U0001f600" * 10
+		for output_format in LZStringFormat:
+			chunks = [ text[i : i + 7] for i in range(0, len(text), 7) ]
+			compressed = list(LZStringCompressor.compress_chunks(chunks, output_format))
+			self.assertEqual(compressed[0][0 : 0].join(compressed), LZStringCompressor.compress_to(text, output_format))
+
+	def test_raw_string_streaming_surrogates(self):
+		rng = random.Random(3)
+		for _ in range(20):
+			data = rng.randbytes(400)
+			expected = LZStringCompressor.compress_to_raw_string(data)
+			compressor = LZStringCompressor(output_format = LZStringFormat.RawString)
+			(chunks, offset) = ([ ], 0)
+			while offset < len(data):
+				length = rng.randint(1, 30)
+				chunks.append(compressor.feed(data[offset : offset + length]))
+				offset += length
+			chunks.append(compressor.flush())
+			self.assertEqual(len("".join(chunks)), len(expected))
+			self.assertEqual("".join(chunks), expected)
+
+		# The output contains U+90C05, whose high surrogate is complete after
+		# the 17th byte has been fed
+		data = bytes.fromhex("d61143243745e8a0ac968177ee7d5befeaa80fa4c716bf78e21d6d3f")
+		compressor = LZStringCompressor(output_format = LZStringFormat.RawString)
+		chunks = [ compressor.feed(data[i : i + 1]) for i in range(len(data)) ] + [ compressor.flush() ]
+		self.assertIn("\U00090c05", chunks)
+		self.assertEqual("".join(chunks), LZStringCompressor.compress_to_raw_string(data))
+
+	def test_statistics(self):
+		self.assertIsNone(LZStringCompressor(b"foo").statistics)
+		for data in [ b"", b"a", "ab€€ab€€aaaa" * 3, os.urandom(300) ]:
+			observed = [ ]
+			compressed = LZStringCompressor.compress_to(data, LZStringFormat.URIComponent, observer = observed.append)
+			LZStringDecompressor.decompress_from(compressed, LZStringFormat.URIComponent, as_text = isinstance(data, str), observer = observed.append)
+			(compress_stats, decompress_stats) = observed
+			self.assertEqual(compress_stats.operation, "compress")
+			self.assertEqual(decompress_stats.operation, "decompress")
+			for stats in observed:
+				self.assertEqual(stats.format, "uri")
+				self.assertEqual(stats.encoded_len, len(compressed))
+				self.assertEqual(stats.uncompressed_len, len(data))
+				self.assertGreaterEqual(stats.lz_seconds, 0)
+				self.assertGreaterEqual(stats.codec_seconds, 0)
+			for field in [ "bit_len", "tokens", "literal_bytes", "literal_words", "max_token_bits", "dictionary_references" ]:
+				self.assertEqual(getattr(compress_stats, field), getattr(decompress_stats, field))
+			self.assertEqual(compress_stats.literal_words, 0 if isinstance(data, bytes) else 1)
+
+	def test_statistics_class_observer(self):
+		observed = [ ]
+		LZStringCompressor.observer = observed.append
+		try:
+			LZStringCompressor.compress_to_base64(b"aaaa")
+		finally:
+			LZStringCompressor.observer = None
+		self.assertEqual(len(observed), 1)
+		self.assertEqual(observed[0].tokens, 4)
+		self.assertEqual(observed[0].literals, 1)
+
+	def test_truncated_input(self):
+		for encoded in [ "", "IY1", "GYexCMEMC" ]:
+			with self.assertRaises(LZStringTruncatedInputException):
+				LZStringDecompressor.decompress_from_base64(encoded)
+		compressed = LZStringCompressor.compress_to_bytes(b"foobar" * 100)
+		with self.assertRaises(LZStringTruncatedInputException):
+			LZStringDecompressor.decompress_from_bytes(compressed[:-3])
+
+		# A failed decode is started over when retried
+		decompressor = LZStringDecompressor.from_format(compressed[:-3], LZStringFormat.Bytes)
+		for attempt in range(2):
+			with self.assertRaises(LZStringTruncatedInputException):
+				decompressor.decompress()
+			self.assertEqual(decompressor.decompress_prefix(10), b"foobarfoob")
+
+	def test_truncated_prefix(self):
+		for data in [ b"ab", b"foobar" * 5 + bytes(range(0, 256, 9)), "Grüße €" * 3 ]:
+			compressed = LZStringCompressor.compress_to_bytes(data)
+			expected = LZStringDecompressor.decompress_from_bytes(compressed)
+			for cut in range(len(compressed)):
+				for prefix in range(1, len(expected) + 1):
+					try:
+						result = LZStringDecompressor.decompress_from_bytes(compressed[:cut], prefix = prefix)
+					except LZStringTruncatedInputException:
+						continue
+					self.assertEqual(result, expected[:prefix])
+				with self.assertRaises(LZStringTruncatedInputException):
+					LZStringDecompressor.from_format(compressed[:cut], LZStringFormat.Bytes).decompress_into(bytearray(len(expected)))
+				writes = [ ]
+				with self.assertRaises(LZStringTruncatedInputException):
+					LZStringDecompressor.from_format(compressed[:cut], LZStringFormat.Bytes).decompress_to(type("Writer", (), { "write": lambda self, chunk: writes.append(bytes(chunk)) })(), flush_size = 1)
+				self.assertTrue(expected.startswith(b"".join(writes)))
+
+	def test_decompression_limits(self):
+		data = b"a" * 10000 + os.urandom(100)
+		compressed = LZStringCompressor.compress_to_bytes(data)
+		exact = DecompressionLimits(max_output = len(data), max_dictionary = 1000, max_input_bits = 8 * len(compressed))
+		self.assertEqual(LZStringDecompressor.decompress_from_bytes(compressed), data)
+		self.assertEqual(LZStringDecompressor.decompress_from(compressed, "bytes", limits = exact), data)
+		self.assertEqual(b"".join(LZStringDecompressor.decompress_chunks([ compressed ], limits = exact)), data)
+
+		for (limits, exception) in [
+				(DecompressionLimits(max_output = len(data) - 1), LZStringOutputLimitException),
+				(DecompressionLimits(max_output = 5000), LZStringOutputLimitException),
+				(DecompressionLimits(max_dictionary = 100), LZStringDictionaryLimitException),
+				(DecompressionLimits(max_input_bits = 8 * len(compressed) - 20), LZStringInputLimitException),
+			]:
+			with self.assertRaises(exception):
+				LZStringDecompressor.decompress_from(compressed, "bytes", limits = limits)
+			with self.assertRaises(exception):
+				b"".join(LZStringDecompressor.decompress_chunks([ compressed ], limits = limits))
+
+	def test_decompression_default_limits(self):
+		LZStringDecompressor.limits = DecompressionLimits(max_output = 100)
+		try:
+			self.assertEqual(LZStringDecompressor.decompress_from_url_component("IY1-kA"), b"a" * 20)
+			with self.assertRaises(LZStringOutputLimitException):
+				LZStringDecompressor.decompress_from_url_component(LZStringCompressor.compress_to_url_component(b"a" * 101))
+		finally:
+			LZStringDecompressor.limits = DecompressionLimits.Unlimited
+
+	def test_decompress_prefix(self):
+		data = b"".join(test_vector["uncompressed"] for test_vector in self._test_vectors) * 5
+		compressed = LZStringCompressor.compress_to_url_component(data)
+		for length in [ 0, 1, 7, 100, 1000, len(data), len(data) + 10 ]:
+			self.assertEqual(LZStringDecompressor.decompress_from_url_component(compressed, prefix = length), data[:length])
+		self.assertEqual(LZStringDecompressor.decompress_from_url_component(compressed, as_text = True, prefix = 10), data[:10].decode())
+
+	def test_decompress_prefix_resumable(self):
+		data = os.urandom(500) + b"foobar" * 500
+		decompressor = LZStringDecompressor.from_format(LZStringCompressor.compress_to_base64(data), LZStringFormat.Base64)
+		self.assertEqual(decompressor.decompress_prefix(100), data[:100])
+		self.assertFalse(decompressor.finished)
+		self.assertIsNone(decompressor.statistics)
+
+		resumed = pickle.loads(pickle.dumps(decompressor))
+		self.assertEqual(resumed.decompress_prefix(50), data[:50])
+		self.assertEqual(resumed.decompress_prefix(1000), data[:1000])
+		self.assertEqual(resumed.decompress(), data)
+		self.assertTrue(resumed.finished)
+		self.assertEqual(resumed.statistics.uncompressed_len, len(data))
+		self.assertEqual(decompressor.decompress(), data)
+
+	def test_decompress_file(self):
+		data = os.urandom(300) + b"foobar" * 300
+		for (input_format, mode) in [ (LZStringFormat.Bytes, "wb"), (LZStringFormat.Uint8Array, "wb"), (LZStringFormat.Base64, "w"), (LZStringFormat.UTF16, "w") ]:
+			with tempfile.NamedTemporaryFile(mode) as f:
+				f.write(LZStringCompressor.compress_to(data, input_format))
+				f.flush()
+				self.assertEqual(LZStringDecompressor.decompress_file(f.name, input_format), data)
+				self.assertEqual(LZStringDecompressor.decompress_file(f.name, input_format, prefix = 10), data[:10])
+
+	def test_decompress_from_buffer(self):
+		data = b"foobar" * 100
+		compressed = bytearray(LZStringCompressor.compress_to_bytes(data))
+		self.assertEqual(LZStringDecompressor.decompress_from_bytes(memoryview(compressed)), data)
+		self.assertEqual(LZStringDecompressor.decompress_from_bytes(compressed), data)
+
+	def test_scan(self):
+		for data in [ b"", b"a", b"aaaa", os.urandom(1000) + b"foobar" * 500, "héllo w€rld" * 50 ]:
+			encoded = LZStringCompressor.compress_to_base64(data)
+			decompressor = LZStringDecompressor.from_format(encoded, LZStringFormat.Base64)
+			result = decompressor.scan()
+			self.assertTrue(result)
+			self.assertEqual(result.uncompressed_len, len(decompressor.decompress()))
+			self.assertEqual(result.tokens, decompressor.statistics.tokens)
+			self.assertEqual(result.dictionary_size, decompressor.statistics.dictionary_size)
+			self.assertEqual(result.bit_len, decompressor.statistics.bit_len)
+			self.assertEqual(LZStringDecompressor.scan_from(encoded, LZStringFormat.Base64, as_text = True).uncompressed_len, len(decompressor.decompress_text()))
+
+	def test_scan_corrupt(self):
+		encoded = LZStringCompressor.compress_to_bytes(b"foobar" * 100)
+		result = LZStringDecompressor.scan_from(encoded[:-2], LZStringFormat.Bytes)
+		self.assertFalse(result.clean)
+		self.assertIn("truncated", result.error)
+		self.assertLess(result.uncompressed_len, 600)
+
+		result = LZStringDecompressor.scan_from(b"\xff\xff\xff", LZStringFormat.Bytes)
+		self.assertFalse(result)
+		self.assertIn("not in compression dictionary", result.error)
+
+	def test_snapshot_fork(self):
+		prefix = b"{\"version\": 3, \"type\": \"telemetry\", \"payload\": "
+		snapshot = LZStringCompressor.snapshot_prefix(prefix, LZStringFormat.Base64)
+		self.assertEqual(snapshot.symbol_count, len(prefix))
+		for suffix in [ b"", b"{}", b"\"version\"" * 20, os.urandom(500) ]:
+			self.assertEqual(snapshot.compress_to(suffix), LZStringCompressor.compress_to_base64(prefix + suffix))
+
+		compressor = snapshot.fork()
+		output = compressor.feed(b"foobar" * 100)
+		output += compressor.flush()
+		self.assertEqual(output, LZStringCompressor.compress_to_base64(prefix + b"foobar" * 100))
+		self.assertEqual(snapshot.compress_to(b"x"), LZStringCompressor.compress_to_base64(prefix + b"x"))
+
+	def test_snapshot_text(self):
+		compressor = LZStringCompressor(output_format = LZStringFormat.UTF16)
+		self.assertEqual(compressor.feed("Grüße, "), "")
+		snapshot = compressor.snapshot()
+		self.assertEqual(compressor.flush(), LZStringCompressor.compress_to_utf16("Grüße, "))
+		self.assertRaises(ValueError, compressor.snapshot)
+		for suffix in [ "Welt €", "Grüße" * 30 ]:
+			self.assertEqual(snapshot.compress_to(suffix), LZStringCompressor.compress_to_utf16("Grüße, " + suffix))
+		fork = snapshot.fork()
+		self.assertRaises(ValueError, fork.compress)
+		self.assertEqual(fork.flush(), LZStringCompressor.compress_to_utf16("Grüße, "))
+
+	def test_snapshot_after_output(self):
+		prefix = bytes(range(150))
+		compressor = LZStringCompressor(output_format = LZStringFormat.Base64)
+		emitted = compressor.feed(prefix)
+		self.assertGreater(len(emitted), 0)
+		with self.assertRaises(ValueError):
+			compressor.snapshot()
+		self.assertEqual(emitted + compressor.flush(), LZStringCompressor.compress_to_base64(prefix))
+
+	def test_resume_at_every_token(self):
+		data = "Grüße €" * 20 + "abc" * 30
+		decompressor = LZStringDecompressor.from_format(LZStringCompressor.compress_to_base64(data), LZStringFormat.Base64)
+		for length in range(len(data) + 1):
+			self.assertEqual(decompressor.decompress_prefix(length, as_text = True), data[:length])
+		self.assertEqual(decompressor.decompress_text(), data)
+
+	def test_decompress_into(self):
+		data = os.urandom(300) + b"foobar" * 300 + "Grüße €".encode("utf-16-le")
+		encoded = LZStringCompressor.compress_to_base64(data)
+		for buffer in [ bytearray(len(data)), bytearray(len(data) + 100), memoryview(bytearray(len(data) + 1))[1:], array.array("B", bytes(len(data))) ]:
+			decompressor = LZStringDecompressor.from_format(encoded, LZStringFormat.Base64)
+			self.assertEqual(decompressor.decompress_into(buffer), len(data))
+			self.assertEqual(bytes(buffer[:len(data)]), data)
+			self.assertEqual(decompressor.statistics.uncompressed_len, len(data))
+			reference = LZStringDecompressor.from_format(encoded, LZStringFormat.Base64)
+			reference.decompress()
+			self.assertEqual(decompressor.statistics, reference.statistics)
+
+		decompressor = LZStringDecompressor.from_format(encoded, LZStringFormat.Base64)
+		with self.assertRaises(ValueError):
+			decompressor.decompress_into(bytearray(len(data) - 1))
+		with self.assertRaises(LZStringOutputLimitException):
+			LZStringDecompressor.from_format(encoded, LZStringFormat.Base64, limits = DecompressionLimits(max_output = 100)).decompress_into(bytearray(len(data)))
+		with self.assertRaises(TypeError):
+			decompressor.decompress_into(bytes(len(data)))
+		self.assertEqual(LZStringDecompressor.from_format(LZStringCompressor.compress_to_bytes(b""), LZStringFormat.Bytes).decompress_into(bytearray()), 0)
+
+	def test_decompress_to(self):
+		data = "Grüße 😀 " * 200 + "abc" * 100
+		encoded = LZStringCompressor.compress_to_utf16(data)
+		for flush_size in [ 1, 7, 1000, 64 * 1024 ]:
+			f = io.BytesIO()
+			decompressor = LZStringDecompressor.from_format(encoded, LZStringFormat.UTF16)
+			self.assertEqual(decompressor.decompress_to(f, flush_size = flush_size), len(f.getvalue()))
+			self.assertEqual(f.getvalue(), decompressor.decompress())
+
+			chunks = [ ]
+			LZStringDecompressor.from_format(encoded, LZStringFormat.UTF16).decompress_to(type("Writer", (), { "write": lambda self, chunk: chunks.append(chunk) })(), flush_size = flush_size)
+			self.assertEqual(b"".join(chunks), f.getvalue())
+
+			writes = [ ]
+			decompressor = LZStringDecompressor.from_format(encoded, LZStringFormat.UTF16)
+			self.assertEqual(decompressor.decompress_prefix(5, as_text = True), data[:5])
+			self.assertEqual(decompressor.decompress_to(type("Writer", (), { "write": lambda self, text: writes.append(text) })(), as_text = True, flush_size = flush_size), len(data.encode("utf-16-le")) // 2)
+			self.assertEqual("".join(writes), data)
+			for text in writes:
+				text.encode("utf-8")
+			if flush_size < 100:
+				self.assertGreater(len(writes), 10)
+
+	def test_compressed_size(self):
+		for data in [ b"", b"a", os.urandom(500), b"foobar" * 300, "Grüße €😀" * 40, "€" * 17 ]:
+			bit_len = LZStringCompressor.compressed_bit_len(data)
+			for fmt in LZStringFormat:
+				encoded = LZStringCompressor.compress_to(data, fmt)
+				length = len(code_units(encoded)) if isinstance(encoded, str) else len(encoded)
+				self.assertEqual(fmt.encoded_len(bit_len), length)
+				self.assertEqual(LZStringCompressor.compressed_size(data, fmt), length)
+				self.assertEqual(LZStringCompressor.compressed_size(data, fmt, budget = length), length)
+				self.assertIsNone(LZStringCompressor.compressed_size(data, fmt, budget = length - 1))
+
+	def test_compressed_size_early_stop(self):
+		data = os.urandom(10000)
+		self.assertIsNone(LZStringCompressor.compressed_bit_len(data, max_bits = 1000))
+		self.assertIsNone(LZStringCompressor.compressed_size(data, LZStringFormat.URIComponent, budget = 2000))
+		self.assertIsNone(LZStringCompressor.compressed_size(b"", LZStringFormat.UTF16, budget = 1))
@@ -21,3 +21,10 @@
 
 from .LZStringTests import LZStringTests
 from .BitStringTests import BitStringTests
+from .BatchTests import BatchTests
+from .AioTests import AioTests
+from .BenchTests import BenchTests
+from .LRUCacheTests import LRUCacheTests
+from .CLITests import CLITests
+from .CodecPoolTests import CodecPoolTests
+from .ComplexityTests import ComplexityTests
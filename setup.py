@@ -16,6 +16,14 @@ setuptools.setup(
 	url = "https://github.com/johndoe31415/pylzstring",
 	download_url = "https://github.com/johndoe31415/pylzstring/archive/v0.0.3.tar.gz",
 	keywords = [ "python", "lzstring" ],
+	extras_require = {
+		"numpy": [ "numpy" ],
+	},
+	entry_points = {
+		"console_scripts": [
+			"lzstr = lzstr.__main__:main",
+		],
+	},
 	classifiers = [
 		"Development Status :: 3 - Alpha",
 		"Intended Audience :: Developers",